@@ -0,0 +1,21 @@
+from langchain_groq import ChatGroq
+from pydantic import SecretStr
+from functools import lru_cache
+import os
+
+
+@lru_cache(maxsize=None)
+def get_groq_llm(model: str) -> ChatGroq:
+    """Return the shared ChatGroq client for a model, creating it on first use.
+
+    Reusing the client keeps its HTTP connection pool warm across requests and
+    across model switches back to a model that was already used.
+    """
+    api_key = os.getenv('GROQ_API_KEY')
+    if not api_key:
+        raise ValueError("GROQ_API_KEY environment variable is not set")
+    return ChatGroq(
+        model=model,
+        api_key=SecretStr(api_key),
+        temperature=0,
+        stop_sequences=None)
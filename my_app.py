@@ -1,8 +1,5 @@
 from textual.app import App
 
-from langchain_groq import ChatGroq
-from pydantic import SecretStr
-
 from textual.widgets import RichLog, Header
 from textual.containers import Vertical, Grid, ScrollableContainer
 from textual_components.terminal_widget import PtyTerminal, TabbedTerminals
@@ -22,6 +19,7 @@ from dotenv import load_dotenv
 from textual_components.chat.chat import Chat
 from textual_components.widget.footer import CommandFooter
 from agents.zapper import Zapper
+from agents.llm import get_groq_llm
 
 
 load_dotenv()
@@ -59,21 +57,9 @@ class Shelly(App):
     ]
     def __init__(self):
         super().__init__()
-        api_key = os.getenv('GROQ_API_KEY')
-        if not api_key:
-            raise ValueError("GROQ_API_KEY environment variable is not set")
-        # Initialize the LLM
-        self.versatile_llm = ChatGroq(
-                model="llama-3.3-70b-versatile",
-                api_key= SecretStr(api_key),
-                temperature=0,
-                stop_sequences=None)
-        self.simple_llm = ChatGroq(
-            model="llama3-8b-8192",
-            api_key=SecretStr(api_key),
-            temperature=0,
-            stop_sequences=None
-        )
+        # Initialize the LLM (clients are shared per model, see get_groq_llm)
+        self.versatile_llm = get_groq_llm("llama-3.3-70b-versatile")
+        self.simple_llm = get_groq_llm("llama3-8b-8192")
         self.zapper = Zapper(self.simple_llm)
         # token usage plot intialization
         self.operation_counter = 0
@@ -4,8 +4,9 @@ from textual.widgets import Static, Input, Button, Tree, Label, Footer
 from textual.widget import Widget
 from textual.reactive import reactive
 from textual.widgets.tree import TreeNode
-from textual.worker import Worker
-from textual import events
+from textual.worker import Worker, WorkerState
+from textual.timer import Timer
+from textual import events, work
 from rich.syntax import Syntax
 from rich.text import Text
 
@@ -13,169 +14,374 @@ from ..architect.tab_button import TabButton
 from ..architect.file_tree import FileExplorer
 from .code_editor import CodeEditor
 
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
 from pathlib import Path
+import asyncio
 import os
+import re
 import fnmatch
-import mimetypes
-from numba import njit
+import threading
+
+MOCK_FILES = (
+    {
+        "name": "src",
+        "type": "folder",
+        "children": [
+            {
+                "name": "components",
+                "type": "folder",
+                "children": [
+                    {"name": "Header.tsx", "type": "file", "language": "typescript", "content": "import React from 'react'\n\nexport const Header = () => {\n  return (\n    <header className=\"bg-gray-800 text-white p-4\">\n      <h1>My App</h1>\n    </header>\n  )\n}"},
+                    {"name": "Footer.tsx", "type": "file", "language": "typescript", "content": "import React from 'react'\n\nexport const Footer = () => {\n  return (\n    <footer className=\"bg-gray-800 text-white p-4\">\n      <p>© 2023 My App</p>\n    </footer>\n  )\n}"},
+                ],
+            },
+            {"name": "App.tsx", "type": "file", "language": "typescript", "content": "import React from 'react'\n\nexport default function App() {\n  return (\n    <div className=\"min-h-screen bg-zinc-900\">\n      <h1>Hello World</h1>\n    </div>\n  )\n}"},
+            {"name": "index.css", "type": "file", "language": "css", "content": "body {\n  margin: 0;\n  padding: 0;\n  font-family: sans-serif;\n}\n\n.container {\n  max-width: 1200px;\n  margin: 0 auto;\n  padding: 0 1rem;\n}"},
+        ],
+    },
+    {
+        "name": "public",
+        "type": "folder",
+        "children": [
+            {"name": "index.html", "type": "file", "language": "html", "content": "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n  <meta charset=\"UTF-8\">\n  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n  <title>My App</title>\n</head>\n<body>\n  <div id=\"root\"></div>\n</body>\n</html>"},
+            {"name": "favicon.ico", "type": "file", "content": "Binary file content..."},
+        ],
+    },
+    {"name": "package.json", "type": "file", "language": "json", "content": "{\n  \"name\": \"my-app\",\n  \"version\": \"0.1.0\",\n  \"private\": true,\n  \"dependencies\": {\n    \"react\": \"^18.2.0\",\n    \"react-dom\": \"^18.2.0\"\n  }\n}"},
+    {"name": "tsconfig.json", "type": "file", "language": "json", "content": "{\n  \"compilerOptions\": {\n    \"target\": \"es5\",\n    \"lib\": [\"dom\", \"dom.iterable\", \"esnext\"],\n    \"allowJs\": true,\n    \"skipLibCheck\": true,\n    \"esModuleInterop\": true,\n    \"strict\": true,\n    \"forceConsistentCasingInFileNames\": true,\n    \"noFallthroughCasesInSwitch\": true,\n    \"module\": \"esnext\",\n    \"moduleResolution\": \"node\",\n    \"resolveJsonModule\": true,\n    \"isolatedModules\": true,\n    \"noEmit\": true,\n    \"jsx\": \"react-jsx\"\n  },\n  \"include\": [\"src\"]\n}"},
+)
+
+# Ignore patterns used by Architect.scan_project_directory
+_IGNORE_DIRS = frozenset({
+    # Version Control
+    '.git', '.svn', '.hg', '.bzr',
+
+    # Python
+    '__pycache__', '.pytest_cache', '.mypy_cache', '.ruff_cache',
+    'venv', '.venv', 'env', '.env', '.tox',
+
+    # Node.js / JavaScript
+    'node_modules', 'bower_components',
+    '.next', '.nuxt', '.gatsby',
+
+    # Build directories
+    'dist', 'build', '_build', 'public/build',
+    'target', 'out', 'output',
+    'bin', 'obj',
+
+    # IDE and editors
+    '.idea', '.vscode', '.vs',
+    '.settings', '.project', '.classpath',
+
+    # Dependencies
+    'vendor', 'packages',
+
+    # Coverage and tests
+    'coverage', '.coverage', 'htmlcov',
+
+    # Mobile
+    'Pods', '.gradle',
+
+    # Misc
+    'tmp', 'temp', 'logs',
+    '.sass-cache', '.parcel-cache',
+    '.cargo', 'artifacts'
+})
+
+_IGNORE_FILES = frozenset({
+    # Python
+    '*.pyc', '*.pyo', '*.pyd',
+    '*.so', '*.egg', '*.egg-info',
+
+    # JavaScript/Web
+    '*.min.js', '*.min.css',
+    '*.chunk.js', '*.chunk.css',
+    '*.bundle.js', '*.bundle.css',
+    '*.hot-update.*',
+
+    # Build artifacts
+    '*.o', '*.obj', '*.a', '*.lib',
+    '*.dll', '*.dylib', '*.so',
+    '*.exe', '*.bin',
+
+    # Logs and databases
+    '*.log', '*.logs',
+    '*.sqlite', '*.sqlite3', '*.db',
+    '*.mdb', '*.ldb',
+
+    # Package locks
+    'package-lock.json', 'yarn.lock',
+    'poetry.lock', 'Pipfile.lock',
+    'pnpm-lock.yaml', 'composer.lock',
+
+    # Environment and secrets
+    '.env', '.env.*', '*.env',
+    '.env.local', '.env.development',
+    '.env.test', '.env.production',
+    '*.pem', '*.key', '*.cert',
+
+    # Cache files
+    '.DS_Store', 'Thumbs.db',
+    '*.cache', '.eslintcache',
+    '*.swp', '*.swo',
+
+    # Documentation build
+    '*.pdf', '*.doc', '*.docx',
+
+    # Images and large media
+    '*.jpg', '*.jpeg', '*.png', '*.gif',
+    '*.ico', '*.svg', '*.woff', '*.woff2',
+    '*.ttf', '*.eot', '*.mp4', '*.mov',
+
+    # Archives
+    '*.zip', '*.tar', '*.gz', '*.rar',
+
+    # Generated sourcemaps
+    '*.map', '*.css.map', '*.js.map'
+})
+
+# File extension (without the dot) to language name
+_LANGUAGE_MAP = {
+    'js': 'javascript',
+    'jsx': 'javascript',
+    'ts': 'typescript',
+    'tsx': 'typescript',
+    'py': 'python',
+    'html': 'html',
+    'css': 'css',
+    'scss': 'scss',
+    'json': 'json',
+    'md': 'markdown',
+    'go': 'go',
+    'rs': 'rust',
+    'java': 'java',
+    'c': 'c',
+    'cpp': 'cpp',
+    'h': 'c',
+    'rb': 'ruby',
+    'php': 'php',
+    'sh': 'shell',
+    'yaml': 'yaml',
+    'yml': 'yaml',
+}
+
+# Status bar text per language, built once rather than on every tab switch
+_STATUS_TEXT = {
+    language: f"main   {language.capitalize()}   UTF-8   Ln 1, Col 1"
+    for language in {*_LANGUAGE_MAP.values(), 'plain'}
+}
+
+def _language_for(path):
+    """Look up the language for a file path from its extension.
+
+    _LANGUAGE_MAP is already keyed on the extension, so the dict lookup is the
+    cache; memoizing on full paths would only hold one entry per file.
+    """
+    _, dot, extension = path.rpartition('.')
+    return _LANGUAGE_MAP.get(extension.lower()) if dot else None
+
+# Extensions that mark a file as binary without opening it
+_BINARY_EXTENSIONS = frozenset({
+    'png', 'jpg', 'jpeg', 'gif', 'bmp', 'ico', 'webp', 'tif', 'tiff',
+    'mp3', 'wav', 'ogg', 'flac', 'mp4', 'mov', 'avi', 'mkv', 'webm',
+    'zip', 'gz', 'tgz', 'bz2', 'xz', '7z', 'rar', 'tar', 'jar', 'whl',
+    'pdf', 'exe', 'dll', 'so', 'dylib', 'o', 'a', 'lib', 'class',
+    'pyc', 'pyo', 'woff', 'woff2', 'ttf', 'otf', 'eot', 'db', 'sqlite',
+})
+
+def _has_binary_extension(path):
+    """Tell from the extension alone, without touching disk, that a file is binary."""
+    _, dot, extension = os.path.basename(path).rpartition('.')
+    return bool(dot) and extension.lower() in _BINARY_EXTENSIONS
+
+def _read_text(path):
+    """Read and decode a file in one pass; None if it looks binary or isn't valid UTF-8."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if b'\0' in data[:4096]:
+        return None
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+@lru_cache(maxsize=8)
+def _compile_globs(patterns):
+    """Combine a frozenset of fnmatch patterns into a single compiled regex."""
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns) or r"(?!)")
+
+def _tab_key(file_data):
+    """Identify an open tab by its file path, or by name for files that only exist in memory."""
+    return file_data.get('path') or file_data['name']
+
+def _list_dir(path, ignore_dirs):
+    """Read a directory with a single os.scandir pass, sorted by name.
+
+    Ignored directories are dropped by name before the sort, and the type
+    check only runs for entries whose name is actually in ignore_dirs.
+    """
+    with os.scandir(path) as it:
+        entries = [
+            entry for entry in it
+            if entry.name not in ignore_dirs or not entry.is_dir(follow_symlinks=False)
+        ]
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+
+def _build_tree(root, ignore_dirs, file_node, folder_node, parent_parts=(), prune_empty=False, on_listed=None):
+    """
+    Build a nested file structure for root without recursing.
+
+    Directories are listed concurrently on a thread pool (os.scandir releases
+    the GIL), and entry types come from the directory listing rather than a
+    stat call per entry. Nodes are built on the calling thread as listings
+    come back, so the result keeps the sorted order of a serial walk.
+
+    Args:
+        root (str): Directory to scan
+        ignore_dirs (set): Directory names to skip
+        file_node (callable): Called as file_node(entry, breadcrumb); returns the
+            dict for a file, or None to leave it out
+        folder_node (callable): Called as folder_node(entry, children); returns
+            the dict for a folder whose children list is filled in later
+        parent_parts (tuple): Names of the folders leading to root
+        prune_empty (bool): Drop folders that end up with no children
+        on_listed (callable): Called as on_listed(path, nodes) once a directory's
+            nodes have been added, so callers can show partial results
+
+    Returns:
+        list: A list of dictionaries representing the directory structure
+    """
+    result = []
+    folders = []
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        pending = {pool.submit(_list_dir, root, ignore_dirs): (root, parent_parts, result)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, parts, siblings = pending.pop(future)
+                try:
+                    entries = future.result()
+                except PermissionError:
+                    # If we can't access the directory, just leave it empty
+                    continue
+                except OSError as e:
+                    print(f"Error scanning {path}: {e}")
+                    continue
+
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        children = []
+                        node = folder_node(entry, children)
+                        siblings.append(node)
+                        folders.append((node, siblings))
+                        pending[pool.submit(_list_dir, entry.path, ignore_dirs)] = (entry.path, parts + (entry.name,), children)
+                    elif entry.is_symlink() and entry.is_dir():
+                        # Linked directories aren't followed (they can loop) and
+                        # can't be opened as files, so leave them out
+                        continue
+                    else:
+                        node = file_node(entry, parts + (entry.name,))
+                        if node is not None:
+                            siblings.append(node)
+
+                if on_listed is not None:
+                    on_listed(path, siblings)
+
+    if prune_empty:
+        # Folders are created after their parents, so walking them backwards
+        # prunes every subfolder before its parent is checked
+        for node, siblings in reversed(folders):
+            if not node["children"]:
+                siblings.remove(node)
+
+    return result
 
 class Architect(Widget):
     """A textual app that mimics a code editor."""
 
     """A textual app that mimics a code editor."""
 
-    DEFAULT_CSS = """
-    /* Namespace all styles under .architect-container to prevent conflicts */
-    .architect-container {
-        background: #1e1e1e;
-        width: 100%;
-        height: 100%;
-        layout: horizontal;  /* Ensure horizontal layout */
-    }
-
-    .architect-container FileExplorer {
-        width: 25%;
-        background: #252526;
-        border-right: solid #3c3c3c;
-    }
-
-    .architect-container #editor-area {
-        width: 1fr;
-    }
-
-    .architect-container #assistant-panel {
-        width: 30%;
-        background: #252526;
-        border-left: solid #3c3c3c;
-    }
-
-    .architect-container #explorer-header {
-        height: 2;
-        background: #252526;
-        border-bottom: solid #3c3c3c;
-        padding: 0 1;
-    }
-
-    .architect-container #explorer-search {
-        margin: 0 1;
-    }
-
-    /* Continue namespacing all other CSS rules... */
-    .architect-container #tabs-bar {
-        height: 3;
-        background: #252526;
-        border-bottom: solid #3c3c3c;
-    }
-
-    .architect-container #breadcrumb-bar {
-        height: 2;
-        background: #252526;
-        border-bottom: solid #3c3c3c;
-        padding: 0 1;
-    }
-
-    .architect-container #status-bar {
-        height: 1;
-        background: #252526;
-        border-top: solid #3c3c3c;
-        padding: 0 1;
-    }
-
-    .architect-container #assistant-header {
-        height: 2;
-        background: #252526;
-        border-bottom: solid #3c3c3c;
-        padding: 0 1;
-    }
-
-    .architect-container #assistant-input {
-        margin: 0 1 1 1;
-    }
-
-    .architect-container #code-view {
-        padding: 1;
-    }
-
-    .architect-container .tab-button {
-        background: #2d2d2d;
-        color: #cccccc;
-        padding: 0 2;
-        border-right: solid #3c3c3c;
-    }
-
-    .architect-container .tab-button:hover {
-        background: #383838;
-    }
-
-    .architect-container .active-tab {
-        background: #1e1e1e;
-        color: #ffffff;
-    }
-
-    .architect-container .breadcrumb {
-        color: #cccccc;
-    }
-
-    .architect-container Button.icon {
-        min-width: 4;
-        padding: 0 1;
-    }
-
-    .architect-container #code-content {
-        width: 100%;
-        height: auto;
-        padding: 1;
-    }
-
-    .architect-container #code-view {
-        height: 1fr;
-        background: #1e1e1e;
-    }
-    """
+    # Loaded once at import; Textual only honours CSS_PATH on App/Screen, not widgets.
+    DEFAULT_CSS = Path(__file__).with_name("architect.tcss").read_text(encoding="utf-8")
 
     is_assistant_open = reactive(True)
     current_file = reactive(None)
     open_tabs = reactive([])
 
+    # Defaults for scan_directory and the async scan worker
+    _DEFAULT_IGNORE_DIRS = frozenset({
+        '.git', '.svn', '.hg', 'node_modules', '__pycache__',
+        '.venv', 'venv', 'env', 'dist', 'build', '.next',
+        '.idea', '.vscode', '.pytest_cache', '.mypy_cache'
+    })
+
+    _DEFAULT_IGNORE_FILES = frozenset({
+        '*.pyc', '*.pyo', '*.dll', '*.obj', '*.o', '*.a', '*.lib',
+        '*.so', '*.dylib', '*.ncb', '*.sdf', '*.suo', '*.pdb',
+        '*.idb', '.DS_Store', '*.class', '*.psd', '*.db', '*.jpg',
+        '*.jpeg', '*.png', '*.gif', '*.svg', '*.eot', '*.ttf',
+        '*.woff', '*.mp4', '*.mp3', '*.lock', 'package-lock.json'
+    })
+
     BINDINGS = [
         ("ctrl+b", "toggle_explorer", "Toggle Explorer"),
         ("ctrl+j", "toggle_assistant", "Toggle Assistant"),
         ("ctrl+w", "close_tab", "Close Tab"),
+        ("ctrl+s", "save_file", "Save File"),
     ]
 
     def __init__(self, chat):
         super().__init__()
-        self.mock_files = [
-            {
-                "name": "src",
-                "type": "folder",
-                "children": [
-                    {
-                        "name": "components",
-                        "type": "folder",
-                        "children": [
-                            {"name": "Header.tsx", "type": "file", "language": "typescript", "content": "import React from 'react'\n\nexport const Header = () => {\n  return (\n    <header className=\"bg-gray-800 text-white p-4\">\n      <h1>My App</h1>\n    </header>\n  )\n}"},
-                            {"name": "Footer.tsx", "type": "file", "language": "typescript", "content": "import React from 'react'\n\nexport const Footer = () => {\n  return (\n    <footer className=\"bg-gray-800 text-white p-4\">\n      <p>© 2023 My App</p>\n    </footer>\n  )\n}"},
-                        ],
-                    },
-                    {"name": "App.tsx", "type": "file", "language": "typescript", "content": "import React from 'react'\n\nexport default function App() {\n  return (\n    <div className=\"min-h-screen bg-zinc-900\">\n      <h1>Hello World</h1>\n    </div>\n  )\n}"},
-                    {"name": "index.css", "type": "file", "language": "css", "content": "body {\n  margin: 0;\n  padding: 0;\n  font-family: sans-serif;\n}\n\n.container {\n  max-width: 1200px;\n  margin: 0 auto;\n  padding: 0 1rem;\n}"},
-                ],
-            },
-            {
-                "name": "public",
-                "type": "folder",
-                "children": [
-                    {"name": "index.html", "type": "file", "language": "html", "content": "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n  <meta charset=\"UTF-8\">\n  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n  <title>My App</title>\n</head>\n<body>\n  <div id=\"root\"></div>\n</body>\n</html>"},
-                    {"name": "favicon.ico", "type": "file", "content": "Binary file content..."},
-                ],
-            },
-            {"name": "package.json", "type": "file", "language": "json", "content": "{\n  \"name\": \"my-app\",\n  \"version\": \"0.1.0\",\n  \"private\": true,\n  \"dependencies\": {\n    \"react\": \"^18.2.0\",\n    \"react-dom\": \"^18.2.0\"\n  }\n}"},
-            {"name": "tsconfig.json", "type": "file", "language": "json", "content": "{\n  \"compilerOptions\": {\n    \"target\": \"es5\",\n    \"lib\": [\"dom\", \"dom.iterable\", \"esnext\"],\n    \"allowJs\": true,\n    \"skipLibCheck\": true,\n    \"esModuleInterop\": true,\n    \"strict\": true,\n    \"forceConsistentCasingInFileNames\": true,\n    \"noFallthroughCasesInSwitch\": true,\n    \"module\": \"esnext\",\n    \"moduleResolution\": \"node\",\n    \"resolveJsonModule\": true,\n    \"isolatedModules\": true,\n    \"noEmit\": true,\n    \"jsx\": \"react-jsx\"\n  },\n  \"include\": [\"src\"]\n}"},
-        ]
-        self.file_structure = self.scan_directory(os.getcwd())
+        self.mock_files = MOCK_FILES
+        # Filled in by the file-scan worker once the widget is mounted
+        self.file_structure = []
         self.chat = chat
+        self._change_timer: Timer | None = None
+        self._pending_change = None
+        # Mounted tab buttons keyed by _tab_key, and the one marked active
+        self._tab_widgets: dict[str, TabButton] = {}
+        self._active_tab: TabButton | None = None
+        # Position of each open tab in open_tabs, keyed by _tab_key
+        self._tab_index: dict[str, int] = {}
+        # Recently opened file contents keyed by (path, mtime_ns), oldest first
+        self._content_cache: OrderedDict[tuple[str, int], tuple[str, bool]] = OrderedDict()
+        # File-load workers can overlap (exclusive doesn't stop a running thread), so
+        # every access to _content_cache holds this lock
+        self._content_cache_lock = threading.Lock()
+
+    def on_mount(self) -> None:
+        """Cache widget references and scan the working directory without blocking the first paint."""
+        self._file_explorer = self.query_one("#file-explorer", FileExplorer)
+        self._tabs_container = self.query_one("#tabs-container", Horizontal)
+        self._breadcrumb = self.query_one("#breadcrumb-container", Static)
+        self._status = self.query_one("#status-bar-content", Static)
+        self._code_editor = self.query_one("#code-content", CodeEditor)
+        self.start_file_scan()
+
+    @work(thread=True, group="file-scan")
+    def _load_file_structure(self):
+        """Scan the working directory on a worker thread.
+
+        The top level is shown as soon as it has been listed; folders in it
+        show their contents once the finished structure arrives.
+        """
+        root = os.getcwd()
+
+        def on_listed(path, nodes):
+            if path == root:
+                # The scan keeps filling these lists, so the tree gets a copy of the
+                # level with folders left empty until their subtrees are complete
+                snapshot = [dict(node, children=[]) if node["type"] == "folder" else node for node in nodes]
+                self.app.call_from_thread(self._file_explorer.update_files, snapshot)
+
+        return self.scan_directory(root, on_listed=on_listed)
 
     def action_toggle_explorer(self) -> None:
         """Toggle file explorer visibility."""
@@ -194,12 +400,14 @@ class Architect(Widget):
             return
 
         # Find the current tab index
-        current_idx = next((i for i, tab in enumerate(self.open_tabs)
-                            if tab['name'] == self.current_file['name']), None)
+        current_idx = self._tab_index.get(_tab_key(self.current_file)) if self.current_file else None
 
         if current_idx is not None:
-            # Remove the tab
+            # Remove the tab and shift the indices of the tabs after it
             removed = self.open_tabs.pop(current_idx)
+            del self._tab_index[_tab_key(removed)]
+            for i in range(current_idx, len(self.open_tabs)):
+                self._tab_index[_tab_key(self.open_tabs[i])] = i
 
             # Update the tabs UI
             self.update_tabs()
@@ -211,104 +419,217 @@ class Architect(Widget):
             else:
                 # No tabs left, clear the editor
                 self.current_file = None
+                self._update_active_tab()
                 self.update_editor()
 
+    async def action_save_file(self) -> None:
+        """Write the current file to disk off the event loop."""
+        if not self.current_file or not self.current_file.get("path") or self._code_editor.read_only:
+            return
+        # Only files whose real content was loaded can be saved; anything else
+        # is showing placeholder text that must never overwrite the file
+        if "original" not in self.current_file:
+            self.notify(f"{self.current_file['name']} was not loaded as text and cannot be saved", severity="warning")
+            return
+        content = self._code_editor.text
+        file_data = self.current_file
+        try:
+            await asyncio.to_thread(Path(file_data["path"]).write_text, content, encoding="utf-8")
+        except OSError as e:
+            # Keep the tab marked modified so the edits aren't mistaken for saved
+            self.notify(f"Could not save {file_data['name']}: {e}", severity="error")
+            return
+        file_data["content"] = content
+        file_data["original"] = content
+        self._set_modified(file_data, False)
+        self.notify(f"Saved {file_data['name']}")
+
     def open_file(self, file_data):
         """Open a file in the editor."""
+        # Re-selecting the open file (e.g. clicking its active tab) changes nothing
+        if file_data is self.current_file:
+            return
         self.current_file = file_data
 
         # Add to tabs if not already open
-        if not any(tab['name'] == file_data['name'] for tab in self.open_tabs):
+        key = _tab_key(file_data)
+        if key not in self._tab_index:
+            self._tab_index[key] = len(self.open_tabs)
             self.open_tabs.append(file_data)
             self.update_tabs()
+        else:
+            self._update_active_tab()
 
         self.update_editor()
 
-    def update_tabs(self):
-        """Update the tabs display."""
-        tabs_container = self.query_one("#tabs-container")
-        tabs_container.remove_children()
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Switch to the file behind a clicked tab."""
+        if isinstance(event.button, TabButton):
+            event.stop()
+            self.open_file(event.button.file_data)
 
-        for tab in self.open_tabs:
-            tab_button = TabButton(
-                f"{tab['name']} ✕",
-                tab,
-                close_callback=self.action_close_tab
-            )
+    def update_tabs(self):
+        """Update the tabs display, mounting and removing only the tabs that changed."""
+        tabs_container = self._tabs_container
+        open_keys = self._tab_index.keys()
 
-            # Mark the current tab as active
-            if self.current_file and tab['name'] == self.current_file['name']:
-                tab_button.add_class("active-tab")
+        for key in self._tab_widgets.keys() - open_keys:
+            self._tab_widgets.pop(key).remove()
 
-            tab_button.add_class("tab-button")
-            tabs_container.mount(tab_button)
+        for tab in self.open_tabs:
+            key = _tab_key(tab)
+            tab_button = self._tab_widgets.get(key)
+            if tab_button is None:
+                tab_button = TabButton(
+                    f"{tab['name']} ✕",
+                    tab,
+                    close_callback=self.action_close_tab
+                )
+                tab_button.add_class("tab-button")
+                self._tab_widgets[key] = tab_button
+                tabs_container.mount(tab_button)
+            # Existing buttons only have their label refreshed
+            tab_button.set_modified(tab.get('modified', False))
+
+        self._update_active_tab()
+
+    def _update_active_tab(self):
+        """Move the active-tab class to the current file's tab."""
+        active = self._tab_widgets.get(_tab_key(self.current_file)) if self.current_file else None
+        if active is self._active_tab:
+            return
+        if self._active_tab is not None:
+            self._active_tab.remove_class("active-tab")
+        if active is not None:
+            active.add_class("active-tab")
+        self._active_tab = active
 
     def on_code_change(self, content: str) -> None:
-        """Save changes when code is modified."""
-        if self.current_file:
-            self.current_file['content'] = content
-            # You might want to add file saving logic here
-            # For example:
-            # with open(self.current_file['path'], 'w') as f:
-            #     f.write(content)
+        """Record changes once typing pauses for 200ms."""
+        # Read-only placeholder text (binary or oversized files) is not an edit
+        if self._code_editor.read_only:
+            return
+        file_data = self.current_file
+        if self._change_timer is not None:
+            self._change_timer.stop()
+            # Don't drop the last edit to a file we've just switched away from
+            if self._pending_change[0] is not file_data:
+                self._flush_change(*self._pending_change)
+        self._pending_change = (file_data, content)
+        self._change_timer = self.set_timer(0.2, lambda: self._flush_change(file_data, content))
+
+    def _flush_change(self, file_data, content: str) -> None:
+        """Store the latest editor content on the file it was typed into."""
+        self._change_timer = None
+        self._pending_change = None
+        if file_data:
+            file_data['content'] = content
+            self._set_modified(file_data, content != file_data.get('original', content))
+
+    def _set_modified(self, file_data, modified) -> None:
+        """Flag a file as changed since it was loaded or saved, touching its tab only on a transition."""
+        if modified == file_data.get('modified', False):
+            return
+        file_data['modified'] = modified
+        tab_button = self._tab_widgets.get(_tab_key(file_data))
+        if tab_button is not None:
+            tab_button.set_modified(modified)
 
     def update_editor(self):
         """Update the editor content."""
-        # Get the CodeEditor widget inside the ScrollableContainer
-        code_editor = self.query_one("#code-content", CodeEditor)
+        code_editor = self._code_editor
 
         if not self.current_file:
-            code_editor.text = "Select a file to view its content"
-            self.query_one("#breadcrumb-container").update("")
-            self.query_one("#status-bar-content").update("")
+            with self.app.batch_update():
+                code_editor.text = "Select a file to view its content"
+                code_editor.read_only = False
+                self._breadcrumb.update("")
+                self._status.update("")
             return
 
-        # Update breadcrumb
-        path_parts = []
-        if self.current_file['name'] == "App.tsx":
-            path_parts = ["src", "App.tsx"]
-        elif self.current_file['name'] in ["Header.tsx", "Footer.tsx"]:
-            path_parts = ["src", "components", self.current_file['name']]
-        else:
-            # Simple fallback
-            path_parts = [self.current_file['name']]
+        content = self.current_file.get('content', 'No content')
+        if len(content) == 0:
+            # Read from disk on a worker; it shows the file once it is loaded
+            self._load_file(self.current_file)
+            return
+        self._show_file(self.current_file, content, self.current_file.get('editable', True))
+
+    @work(thread=True, exclusive=True, group="file-load")
+    def _load_file(self, file_data):
+        """Read a file off the event loop and hand it back to the editor."""
+        content, editable = self._read_content(file_data["path"])
+        self.app.call_from_thread(self._show_loaded_file, file_data, content, editable)
+
+    def _show_loaded_file(self, file_data, content, editable):
+        """Show a file read by _load_file, unless another file was opened meanwhile."""
+        if file_data is not self.current_file:
+            return
+        # Remembered so reopening the tab keeps placeholder text read-only
+        file_data['editable'] = editable
+        if editable:
+            file_data['original'] = content
+        self._show_file(file_data, content, editable)
+
+    def _show_file(self, file_data, content, editable=True):
+        """Show content in the editor along with the file's breadcrumb and status bar."""
+        code_editor = self._code_editor
 
-        breadcrumb_text = " > ".join(path_parts)
-        self.query_one("#breadcrumb-container").update(breadcrumb_text)
+        # Update breadcrumb
+        breadcrumb_text = " > ".join(file_data.get('breadcrumb', (file_data['name'],)))
 
         # Update status bar
-        language = self.current_file.get('language', 'plain')
-        status_text = f"main   {language.capitalize()}   UTF-8   Ln 1, Col 1"
-        self.query_one("#status-bar-content").update(status_text)
+        language = file_data.get('language', 'plain')
+        status_text = _STATUS_TEXT.get(language) or f"main   {language.capitalize()}   UTF-8   Ln 1, Col 1"
 
-        # Update code view with the appropriate language
-        content = self.current_file.get('content', 'No content')
-        if len(content) == 0:
-            if not self.is_text_file(self.current_file["path"]):
-                content = "The content is not UTF-8 decodable and cannot be read."
+        # Try to determine language based on file extension
+        language = _language_for(file_data.get('path', ''))
+        if language not in code_editor.available_languages:
+            language = None
+
+        # Apply every widget update in a single render
+        with self.app.batch_update():
+            self._breadcrumb.update(breadcrumb_text)
+            self._status.update(status_text)
+            code_editor.language = language
+            # Placeholder text for unreadable files must never be saved over them.
+            # Set before the text so the change it posts is seen as read-only.
+            code_editor.read_only = not editable
+            code_editor.text = content
+
+    def _read_content(self, path, max_file_size=500*1024):
+        """
+        Read a file for the editor, reusing the last read while it is unchanged on disk.
+
+        Returns:
+            tuple: The text to show, and whether it is the file's real content
+        """
+        if _has_binary_extension(path):
+            return "The content is not UTF-8 decodable and cannot be read.", False
+        try:
+            stat_info = os.stat(path)
+        except OSError:
+            return "The content is not UTF-8 decodable and cannot be read.", False
+        key = (path, stat_info.st_mtime_ns)
+        with self._content_cache_lock:
+            cached = self._content_cache.get(key)
+            if cached is not None:
+                self._content_cache.move_to_end(key)
+                return cached
+
+        if stat_info.st_size > max_file_size:
+            result = f"File too large ({stat_info.st_size} bytes)...", False
+        else:
+            content = _read_text(path)
+            if content is None:
+                result = "The content is not UTF-8 decodable and cannot be read.", False
             else:
-                with open(self.current_file["path"]) as f:
-                    content = f.read()
-        language = None
+                result = content, True
 
-        # Try to determine language based on file extension
-        file_path = self.current_file.get('path', '')
-        if file_path:
-            if file_path.endswith('.py'):
-                language = 'python'
-            elif file_path.endswith('.js'):
-                language = 'javascript'
-            elif file_path.endswith('.ts'):
-                language = 'typescript'
-            elif file_path.endswith('.html'):
-                language = 'html'
-            elif file_path.endswith('.css'):
-                language = 'css'
-            # Add more file extensions as needed
-
-        # Update the editor content and language
-        code_editor.language = language
-        code_editor.text = content
+        with self._content_cache_lock:
+            self._content_cache[key] = result
+            if len(self._content_cache) > 32:
+                self._content_cache.popitem(last=False)
+        return result
 
     def compose(self) -> ComposeResult:
             """Create child widgets."""
@@ -359,103 +680,28 @@ class Architect(Widget):
     def start_file_scan(self):
         """Begin scanning files in the background"""
         self.scanning = True
+        self.scan_complete = False
 
-        # Run the scan in a worker
-        self.run_worker(self._scan_directory_structure_worker(os.getcwd()))
-
-    async def _scan_directory_structure_worker(self, directory_path, ignore_dirs=None):
-        """Worker method that runs in a separate worker"""
-        if ignore_dirs is None:
-            ignore_dirs = {
-                '.git', '.svn', '.hg', 'node_modules', '__pycache__',
-                '.venv', 'venv', 'env', 'dist', 'build', '.next',
-                '.idea', '.vscode', '.pytest_cache', '.mypy_cache'
-            }
-
-        result = []
-        try:
-            entries = sorted(os.listdir(directory_path))
-
-            for entry in entries:
-                full_path = os.path.join(directory_path, entry)
+        # Run the scan in a worker thread; on_worker_state_changed picks up the result
+        self._load_file_structure()
 
-                # Skip ignored directories
-                if os.path.isdir(full_path) and entry in ignore_dirs:
-                    continue
-
-                if os.path.isdir(full_path):
-                    # Recursively scan subdirectory structure only
-                    children = await self._scan_directory_structure_worker(
-                        full_path, ignore_dirs
-                    )
-                    # Add directory to results
-                    result.append({
-                        "name": entry,
-                        "type": "folder",
-                        "path": full_path,  # Store full path for later
-                        "children": children
-                    })
-                else:
-                    # Just add metadata, not content
-                    extension = os.path.splitext(entry)[1].lower()
-                    file_data = {
-                        "name": entry,
-                        "type": "file",
-                        "path": full_path,  # Store full path for later
-                        "size": os.path.getsize(full_path)
-                    }
-
-                    # Detect language from extension
-                    language_map = {
-                        '.js': 'javascript',
-                        '.jsx': 'javascript',
-                        '.ts': 'typescript',
-                        '.tsx': 'typescript',
-                        '.py': 'python',
-                        '.html': 'html',
-                        '.css': 'css',
-                        '.scss': 'scss',
-                        '.json': 'json',
-                        '.md': 'markdown',
-                        '.go': 'go',
-                        '.rs': 'rust',
-                        '.java': 'java',
-                        '.c': 'c',
-                        '.cpp': 'cpp',
-                        '.h': 'c',
-                        '.rb': 'ruby',
-                        '.php': 'php',
-                        '.sh': 'shell',
-                        '.yaml': 'yaml',
-                        '.yml': 'yaml',
-                    }
-                    language = language_map.get(extension)
-                    if language:
-                        file_data["language"] = language
-
-                    result.append(file_data)
-        except Exception as e:
-            print(f"Error scanning {directory_path}: {e}")
-            return []
-
-        return result
-
-    def on_worker_completed(self, event: Worker.StateChanged) -> None:
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
         """Handle worker completion"""
-        if event.worker.state == "SUCCESS":
+        if event.worker.group == "file-load":
+            return
+        if event.state == WorkerState.SUCCESS:
             # This is our file structure scan worker
             self.file_structure = event.worker.result
             self.scan_complete = True
             self.scanning = False
 
             # Update the file explorer with the structure
-            file_explorer = self.query_one("#file-explorer")
-            file_explorer.update_files(self.file_structure)
+            self._file_explorer.update_files(self.file_structure)
 
             # Notify the user that scanning is complete
             self.notify("File scanning complete")
 
-    def scan_directory(self, directory_path, ignore_dirs=None, ignore_files=None, max_file_size=500*1024):
+    def scan_directory(self, directory_path, ignore_dirs=None, ignore_files=None, max_file_size=500*1024, parent_parts=(), on_listed=None):
         """
         Scan a directory and create a hierarchical structure of files and folders.
 
@@ -464,255 +710,83 @@ class Architect(Widget):
             ignore_dirs (set): Set of directory names to ignore
             ignore_files (set): Set of file patterns to ignore
             max_file_size (int): Maximum file size to read content (in bytes)
+            parent_parts (tuple): Names of the folders leading to directory_path,
+                used to build each file's breadcrumb
+            on_listed (callable): Called with (path, nodes) as each directory is listed
 
         Returns:
             list: A list of dictionaries representing the directory structure
         """
         if ignore_dirs is None:
-            ignore_dirs = {
-                '.git', '.svn', '.hg', 'node_modules', '__pycache__',
-                '.venv', 'venv', 'env', 'dist', 'build', '.next',
-                '.idea', '.vscode', '.pytest_cache', '.mypy_cache'
-            }
+            ignore_dirs = self._DEFAULT_IGNORE_DIRS
 
         if ignore_files is None:
-            ignore_files = {
-                '*.pyc', '*.pyo', '*.dll', '*.obj', '*.o', '*.a', '*.lib',
-                '*.so', '*.dylib', '*.ncb', '*.sdf', '*.suo', '*.pdb',
-                '*.idb', '.DS_Store', '*.class', '*.psd', '*.db', '*.jpg',
-                '*.jpeg', '*.png', '*.gif', '*.svg', '*.eot', '*.ttf',
-                '*.woff', '*.mp4', '*.mp3', '*.lock', 'package-lock.json'
-            }
+            ignore_files = self._DEFAULT_IGNORE_FILES
 
-        result = []
+        ignored_re = _compile_globs(frozenset(ignore_files))
 
-        try:
-            entries = sorted(os.listdir(directory_path))
+        # Resolve the root once; every entry.path below it is then already absolute
+        directory_path = os.path.abspath(directory_path)
 
-            for entry in entries:
-                full_path = os.path.join(directory_path, entry)
+        def file_node(entry, breadcrumb):
+            if ignored_re.match(entry.name) is not None:
+                return None
 
-                # Skip if the entry should be ignored
-                if os.path.isdir(full_path) and entry in ignore_dirs:
-                    continue
+            # Only read content if it's not a binary file and not too large
+            '''
+            if not self.is_binary_file(entry.path):
+                stat_info = entry.stat()
+                if stat_info.st_size <= max_file_size:
+                    try:
+                        with open(entry.path, 'r', encoding='utf-8') as f:
+                            file_data["content"] = f.read()
+                    except UnicodeDecodeError:
+                        file_data["content"] = "Binary file content..."
+                else:
+                    file_data["content"] = f"File too large ({stat_info.st_size} bytes)..."
+            else:
+                file_data["content"] = "Binary file content..."
+            '''
+            file_data = {
+                "name": entry.name,
+                "type": "file",
+                "content": "",
+                "path": entry.path,
+                "breadcrumb": breadcrumb
+            }
 
-                if os.path.isfile(full_path) and any(
-                    fnmatch.fnmatch(entry, pattern) for pattern in ignore_files
-                ):
-                    continue
+            # Add language info if we can detect it
+            language = self.detect_language(entry.name)
+            if language:
+                file_data["language"] = language
+            return file_data
 
-                if os.path.isdir(full_path):
-                    # Recursively scan subdirectory
-                    children = self.scan_directory(full_path, ignore_dirs, ignore_files, max_file_size)
-                    if children:  # Only add non-empty directories
-                        result.append({
-                            "name": entry,
-                            "type": "folder",
-                            "children": children,
-                            "abs_path": os.path.abspath(full_path)
-                        })
-                else:
-                    # Process file
-                    try:
-                        file_data = {"name": entry, "type": "file"}
-
-                        # Add language info if we can detect it
-                        language = self.detect_language(full_path)
-                        if language:
-                            file_data["language"] = language
-
-                        # Only read content if it's not a binary file and not too large
-                        '''
-                        if not self.is_binary_file(full_path):
-                            stat_info = os.stat(full_path)
-                            if stat_info.st_size <= max_file_size:
-                                try:
-                                    with open(full_path, 'r', encoding='utf-8') as f:
-                                        file_data["content"] = f.read()
-                                except UnicodeDecodeError:
-                                    file_data["content"] = "Binary file content..."
-                            else:
-                                file_data["content"] = f"File too large ({stat_info.st_size} bytes)..."
-                        else:
-                            file_data["content"] = "Binary file content..."
-                        '''
-                        file_data["content"] = ""
-                        file_data["path"] = os.path.abspath(full_path)
-
-                        result.append(file_data)
-                    except Exception as e:
-                        # If there's an error reading the file, include a note
-                        result.append({
-                            "name": entry,
-                            "type": "file",
-                            "error": str(e)
-                        })
-        except PermissionError:
-            # If we can't access the directory, just return it as inaccessible
-            return []
-        except Exception as e:
-            # Handle unexpected errors
-            print(f"Error scanning {directory_path}: {e}")
-            return []
+        def folder_node(entry, children):
+            return {
+                "name": entry.name,
+                "type": "folder",
+                "children": children,
+                "abs_path": entry.path
+            }
 
-        return result
+        # Only non-empty directories are kept
+        return _build_tree(directory_path, ignore_dirs, file_node, folder_node, parent_parts, prune_empty=True, on_listed=on_listed)
 
     def scan_project_directory(self, start_path=None, max_file_size=500*1024):
         """
         Scan a project directory and return the file structure
         """
-        import fnmatch
-
         # If no path is provided, use the current directory
         if start_path is None:
             start_path = os.getcwd()
 
-        # Define ignore patterns
-        ignore_dirs = {
-            # Version Control
-            '.git', '.svn', '.hg', '.bzr',
-
-            # Python
-            '__pycache__', '.pytest_cache', '.mypy_cache', '.ruff_cache',
-            'venv', '.venv', 'env', '.env', '.tox',
-
-            # Node.js / JavaScript
-            'node_modules', 'bower_components',
-            '.next', '.nuxt', '.gatsby',
-
-            # Build directories
-            'dist', 'build', '_build', 'public/build',
-            'target', 'out', 'output',
-            'bin', 'obj',
-
-            # IDE and editors
-            '.idea', '.vscode', '.vs',
-            '.settings', '.project', '.classpath',
-
-            # Dependencies
-            'vendor', 'packages',
-
-            # Coverage and tests
-            'coverage', '.coverage', 'htmlcov',
-
-            # Mobile
-            'Pods', '.gradle',
-
-            # Misc
-            'tmp', 'temp', 'logs',
-            '.sass-cache', '.parcel-cache',
-            '.cargo', 'artifacts'
-        }
-
-        ignore_files = {
-            # Python
-            '*.pyc', '*.pyo', '*.pyd',
-            '*.so', '*.egg', '*.egg-info',
-
-            # JavaScript/Web
-            '*.min.js', '*.min.css',
-            '*.chunk.js', '*.chunk.css',
-            '*.bundle.js', '*.bundle.css',
-            '*.hot-update.*',
-
-            # Build artifacts
-            '*.o', '*.obj', '*.a', '*.lib',
-            '*.dll', '*.dylib', '*.so',
-            '*.exe', '*.bin',
-
-            # Logs and databases
-            '*.log', '*.logs',
-            '*.sqlite', '*.sqlite3', '*.db',
-            '*.mdb', '*.ldb',
-
-            # Package locks
-            'package-lock.json', 'yarn.lock',
-            'poetry.lock', 'Pipfile.lock',
-            'pnpm-lock.yaml', 'composer.lock',
-
-            # Environment and secrets
-            '.env', '.env.*', '*.env',
-            '.env.local', '.env.development',
-            '.env.test', '.env.production',
-            '*.pem', '*.key', '*.cert',
-
-            # Cache files
-            '.DS_Store', 'Thumbs.db',
-            '*.cache', '.eslintcache',
-            '*.swp', '*.swo',
-
-            # Documentation build
-            '*.pdf', '*.doc', '*.docx',
-
-            # Images and large media
-            '*.jpg', '*.jpeg', '*.png', '*.gif',
-            '*.ico', '*.svg', '*.woff', '*.woff2',
-            '*.ttf', '*.eot', '*.mp4', '*.mov',
-
-            # Archives
-            '*.zip', '*.tar', '*.gz', '*.rar',
-
-            # Generated sourcemaps
-            '*.map', '*.css.map', '*.js.map'
-        }
-
         # Start scanning from the directory
-        result = self.scan_directory(start_path, ignore_dirs, ignore_files, max_file_size)
+        result = self.scan_directory(start_path, _IGNORE_DIRS, _IGNORE_FILES, max_file_size)
 
         return result
 
 
-    def detect_language(self, file_path):
+    @staticmethod
+    def detect_language(file_path):
         """Detect the programming language based on file extension"""
-        extension = Path(file_path).suffix.lower()
-        language_map = {
-            '.js': 'javascript',
-            '.jsx': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.py': 'python',
-            '.html': 'html',
-            '.css': 'css',
-            '.scss': 'scss',
-            '.json': 'json',
-            '.md': 'markdown',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.java': 'java',
-            '.c': 'c',
-            '.cpp': 'cpp',
-            '.h': 'c',
-            '.rb': 'ruby',
-            '.php': 'php',
-            '.sh': 'shell',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-        }
-        return language_map.get(extension, None)
-
-    def is_binary_file(self, file_path):
-        """Check if a file is binary"""
-        mime_type, _ = mimetypes.guess_type(file_path)
-        if mime_type is None:
-            # Read the first chunk of the file to check for binary content
-            try:
-                with open(file_path, 'rb') as f:
-                    chunk = f.read(1024)
-                    return b'\0' in chunk
-            except:
-                return True
-        return mime_type.startswith(('image/', 'audio/', 'video/', 'application/')) and not mime_type.endswith(('json', 'xml', 'javascript', 'html'))
-
-    def is_text_file(self, file_path):
-        """Check if a file is a valid UTF-8 text file"""
-        try:
-            # Try to read a small chunk of the file as UTF-8
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Read just enough to determine if it's text (4KB should be sufficient)
-                f.read(4096)
-            return True
-        except UnicodeDecodeError:
-            return False
-        except Exception:
-            # For any other errors (like permission issues), assume it's not a text file
-            return False
+        return _language_for(file_path)
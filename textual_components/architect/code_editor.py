@@ -40,11 +40,11 @@ class CodeEditor(TextArea):
         )
         self.on_change_callback = on_change
         
-    def watch_value(self, value: str) -> None:
+    def on_text_area_changed(self, event: TextArea.Changed) -> None:
         """Handle changes to editor content."""
         # Call the on_change callback if it exists
         if self.on_change_callback:
-            self.on_change_callback(value)
+            self.on_change_callback(self.text)
     
     def on_mount(self) -> None:
         """Set up the editor when it's mounted."""
@@ -62,9 +62,6 @@ class CodeEditor(TextArea):
     def insert_completion(self, completion: str) -> None:
         """Insert a code completion at the current cursor position."""
         if not self.read_only:
-            current_pos = self.selection.end
-            # Insert the completion at the cursor position
-            self._replace_via_keyboard(completion, *self.selection)
-            # Update cursor position
-            new_pos = (current_pos[0], current_pos[1] + len(completion))
-            self.move_cursor(new_pos)
+            # Insert the completion at the cursor position; the edit leaves the cursor after it
+            start, end = self.selection
+            self._replace_via_keyboard(completion, start, end)
@@ -7,6 +7,10 @@ from textual import events
 from rich.syntax import Syntax
 from rich.text import Text
 
+def _folder_key(folder):
+    """Identify a folder across rescans by its path, falling back to its name"""
+    return folder.get("abs_path") or folder.get("path") or folder["name"]
+
 class FileExplorer(Tree):
     """File explorer tree component."""
 
@@ -14,27 +18,67 @@ class FileExplorer(Tree):
         super().__init__(name=name, label="Files", id=id, classes=classes)
         self.files = files or []
         self.architect = architect
+        # Folders to reopen while update_files rebuilds the tree
+        self._reopen = set()
     def on_mount(self):
         """Initialize the file tree."""
         self.root.expand()
         self._load_files(self.files, self.root)
 
+    def update_files(self, files):
+        """Replace the tree contents with a new file structure, keeping open folders open."""
+        self.files = files or []
+        self._reopen = self._expanded_folders()
+        self.clear()
+        self.root.expand()
+        self._load_files(self.files, self.root)
+        self._reopen = set()
+
+    def _expanded_folders(self):
+        """Keys of the folders currently expanded in the tree."""
+        expanded = set()
+        stack = list(self.root.children)
+        while stack:
+            node = stack.pop()
+            if node.data and node.allow_expand and node.is_expanded:
+                expanded.add(_folder_key(node.data))
+                stack.extend(node.children)
+        return expanded
+
     def _load_files(self, files, parent):
-        """Recursively load files into the tree."""
-        for file in files:
-            icon = "📁 " if file["type"] == "folder" else "📄 "
-            node = parent.add(icon + file["name"], data=file)
-            if file["type"] == "folder" and file.get("children"):
-                self._load_files(file["children"], node)
-                # Auto expand src folder
-                if file["name"] == "src":
-                    node.expand()
+        """Load one level of files into the tree.
+
+        Folder contents are only turned into nodes when the folder is first
+        expanded, so the tree holds nodes for expanded folders rather than
+        for the whole project.
+        """
+        # Add the whole level before the tree is redrawn
+        with self.app.batch_update():
+            for file in files:
+                if file["type"] == "folder":
+                    node = parent.add("📁 " + file["name"], data=file)
+                    if _folder_key(file) in self._reopen:
+                        # Open before the rebuild: restore it and its open subfolders now
+                        node.expand()
+                        if file.get("children"):
+                            self._load_files(file["children"], node)
+                    # Auto expand src folder
+                    elif file["name"] == "src":
+                        node.expand()
+                else:
+                    # Files are leaves, so selection can tell them apart from folders without reading data
+                    parent.add_leaf("📄 " + file["name"], data=file)
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        """Populate a folder the first time it is expanded."""
+        node = event.node
+        if node.data and not node.children and node.data.get("children"):
+            self._load_files(node.data["children"], node)
 
     def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
         """Handle node selection."""
-        file_data = event.node.data
-        if file_data["type"] == "file":
-            self.architect.open_file(file_data)
+        if not event.node.allow_expand:
+            self.architect.open_file(event.node.data)
         else:
             # Toggle folder expansion
             if event.node.is_expanded:
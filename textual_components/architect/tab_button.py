@@ -14,7 +14,12 @@ class TabButton(Button):
         super().__init__(label)
         self.file_data = file_data
         self.close_callback = close_callback
+        self._modified = False
 
-    def on_click(self):
-        """Handle click events."""
-        self.app.open_file(self.file_data)
+    def set_modified(self, modified):
+        """Mark the tab as having unsaved changes by updating its label in place."""
+        if modified == self._modified:
+            return
+        self._modified = modified
+        marker = "● " if modified else ""
+        self.label = f"{self.file_data['name']} {marker}✕"
@@ -9,10 +9,10 @@ from textual.reactive import var
 from textual import on, events, work
 from textual.events import Key
 from textual.worker import Worker, WorkerState
+from textual.timer import Timer
 
 
-from langchain.schema import BaseMessage, HumanMessage, AIMessage
-from langchain.prompts import ChatPromptTemplate
+from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
 
 from ..widget.chatbox import Chatbox, ChatboxContainer
 from ..commands.file_search import SlashCommandPopup
@@ -25,14 +25,130 @@ from ..commands.autocomplete import AutoComplete, Dropdown, DropdownItem
 from ..chat.chat_input_area import ChatInputArea, ScrollableChatContainer
 from ..architect.architect import Architect
 
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List
+from typing import Iterable, Iterator, List
 import os
+import re
 import asyncio
+import io
+import subprocess
+import traceback
 from functools import lru_cache
 
+SYS = "You are a helpful AI assistant. Provide clear and concise responses for the user's requests. Use a combination of your own knowledge and the context, with more emphasis on using the context."
+CONTEXT_PREFIX = "Here are previous messages you should use for context:"
+
+# Shortest gap between screen updates while a reply streams (about 60 a second)
+_STREAM_FRAME = 0.016
+
+# Caps on how much file text a single command adds to the prompt
+_MAX_FILE_BYTES = 65_536
+_MAX_DIR_BYTES = 512_000
+
+# Indentation for each depth of the debug widget tree
+_INDENTS = ["  " * depth for depth in range(32)]
+
+# Context windows of the models offered in the chat header, in tokens
+_MODEL_MAX_TOKENS = {
+    "llama-3.3-70b-versatile": 131_072,
+    "llama3-8b-8192": 8_192,
+    "qwen-2.5-32b": 131_072,
+    "deepseek-r1-distill-qwen-32b": 131_072,
+}
+_DEFAULT_MAX_TOKENS = 8_192
+# Room left in the window for the reply
+_MAX_NEW_TOKENS = 1_024
+
+# Files a directory command pulls into the prompt
+_CMD = re.compile(r"^(?P<cmd>:[fd]|@(?:file|dir))\s+(?P<arg>\S+)\s*$")
+_FILE_COMMANDS = frozenset({":f", "@file"})
+_SOURCE_SUFFIXES = frozenset({'.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.cpp', '.h', '.rs', '.go'})
+_IGNORED_PATH_RE = re.compile(r"(?:^|/)(?:\.git|__pycache__|node_modules)(?:/|$)")
+
+
+def _git_dir(root: str) -> str | None:
+    """The git directory for root, or None outside a git repo.
+
+    Asks git rather than looking for .git/index, since .git is a file in worktrees and submodules.
+    """
+    try:
+        result = subprocess.run(["git", "-C", root, "rev-parse", "--absolute-git-dir"], capture_output=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8', errors='replace').strip()
+
+
+def _git_ls_files(root: str, *args: str) -> list[str] | None:
+    """Paths from git ls-files relative to root, or None if git fails"""
+    try:
+        result = subprocess.run(["git", "-C", root, "ls-files", "-z", *args], capture_output=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return [path for path in result.stdout.decode('utf-8', errors='replace').split('\0') if path]
+
+
+@lru_cache(maxsize=8)
+def _tracked_files(root: str, git_dir: str, index_mtime: int) -> tuple[str, ...] | None:
+    """Tracked files under root; index_mtime keys the cache so it is rebuilt when the index changes"""
+    paths = _git_ls_files(root, "--cached")
+    return tuple(paths) if paths is not None else None
+
+
+def _count_tokens(text: str) -> int:
+    """Estimate the tokens a message costs: about four characters per token plus per-message overhead"""
+    return len(text) // 4 + 4
+
+
+def _read_truncated(path: Path, max_bytes: int = _MAX_FILE_BYTES) -> str:
+    """Read at most max_bytes of a UTF-8 file, marking the text when the rest was cut off"""
+    with open(path, 'rb') as f:
+        data = f.read(max_bytes + 1)
+    truncated = len(data) > max_bytes
+    data = data[:max_bytes]
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # The cut may land inside a multi-byte character; anything earlier is a real decode error
+        if not truncated or e.start < len(data) - 3:
+            raise
+        text = data[:e.start].decode('utf-8')
+    return text + "\n# ... truncated" if truncated else text
+
+
+def _list_project_files(root: str) -> list[str]:
+    """Source files under root, relative to it and sorted.
+
+    Inside a git repo the listing comes from git ls-files, so ignored files are never
+    touched. Tracked files are cached per index state; untracked ones are listed each
+    time, as creating a file doesn't touch the index. Outside a repo the tree is walked.
+    """
+    paths = None
+    git_dir = _git_dir(root)
+    if git_dir is not None:
+        try:
+            index_mtime = os.stat(os.path.join(git_dir, 'index')).st_mtime_ns
+        except OSError:
+            # A repo with nothing staged yet has no index
+            index_mtime = 0
+        tracked = _tracked_files(root, git_dir, index_mtime)
+        untracked = _git_ls_files(root, "--others", "--exclude-standard")
+        if tracked is not None and untracked is not None:
+            paths = [*tracked, *untracked]
+    if paths is None:
+        root_path = Path(root)
+        paths = [p.relative_to(root_path).as_posix() for p in root_path.rglob('*') if p.is_file()]
+    return sorted(
+        path for path in paths
+        if os.path.splitext(path)[1].lower() in _SOURCE_SUFFIXES and not _IGNORED_PATH_RE.search(path)
+    )
+
 
 
 class Chat(Widget):
@@ -46,14 +162,33 @@ class Chat(Widget):
         self.responding_indicator = IsTyping()
         self.responding_indicator.display = False
         self.chatboxes = {}
+        # Chatboxes that received streamed tokens since the last screen update
+        self._dirty_boxes: set[Chatbox] = set()
+        # The chatbox the current reply is streaming into
+        self._streaming_box: Chatbox | None = None
+        # Set when a chatbox is added to _dirty_boxes; wakes _render_stream
+        self._stream_dirty = asyncio.Event()
+        # Pending scroll_to_latest_message, and the bottom it last scrolled to
+        self._scroll_timer: Timer | None = None
+        self._last_scroll_y = -1
         self.multiline = True
-        # Initialize debug output
+        # Initialize debug output; nothing is written unless SHELLY_DEBUG is set
         self.debug_log = None
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a helpful AI assistant. Provide clear and concise responses for the user's requests. Use a combination of your own knowledge and the context, with more emphasis on using the context."),
-            ("user", "{input}"),
-            ("user", "Here are previous messages you should use for context: {context}"),
-        ])
+        self._debug_enabled = bool(os.environ.get("SHELLY_DEBUG"))
+        # Built once; every request starts with this same message
+        self._system_message = SystemMessage(content=SYS)
+        # Rendered context: (context list id, first rendered index, end index, last rendered message, text)
+        self._context_render: tuple[int, int, int, BaseMessage | None, str] = (0, 0, 0, None, "")
+        # Token estimates for every context message counted so far, the index of the
+        # first message that fits the window, and the sum of the estimates from there on
+        self._context_tokens: list[int] = []
+        self._context_start = 0
+        self._context_tokens_kept = 0
+        self._context_tokens_id = 0
+        # Summaries run in the background; keep references so they are not collected mid-flight
+        self._bg_tasks: set[asyncio.Task] = set()
+        # Serializes updates to the shared conversation state and summaries
+        self._state_lock = asyncio.Lock()
 
 
     allow_input_submit = var(True)
@@ -64,7 +199,7 @@ class Chat(Widget):
         return self._app.versatile_llm
     @llm.setter
     def llm(self, value):
-        self._app_versatile_llm = value
+        self._app.versatile_llm = value
 
     @property
     def context(self):
@@ -177,7 +312,8 @@ class Chat(Widget):
     def on_submit(self, event: Button.Pressed):
         event.stop()
         self.input_area.post_message(ChatInputArea.Submit(self.input_area))
-        self._debug_widget_tree(self, 0)
+        if self._debug_enabled and self.debug_log is not None:
+            self._debug_widget_tree(self, 0)
 
     @on(ChatHistory.ChatOpened)
     async def on_chat_opened(self, message: ChatHistory.ChatOpened) -> None:
@@ -202,13 +338,8 @@ class Chat(Widget):
         if self.chat_container:
             self.chat_container.remove_children()
 
-        # Create new conversation
+        # Create new conversation; it joins the history list once its first message is sent
         self.is_new_chat = True
-        # Refresh the option list
-        option_list = self.query_one("#cl-option-list", OptionList)
-        option_list.clear_options()
-        options = self.chat_history._load_conversations()
-        option_list.add_options([Option(data["chat_name"] if len(data["chat_name"]) < 40 else data["chat_name"][:40] + "...", id=conv_id) for conv_id, data in options.items()])
 
     @dataclass
     class MessageSubmitted(Message):
@@ -220,95 +351,117 @@ class Chat(Widget):
         message: BaseMessage
 
     async def mount_message(self, chatbox: Chatbox):
-        # Create container with proper styling
-        container = ChatboxContainer()
+        # Create container with proper styling; the box mounts along with it
         assert self.chat_container
-        await self.chat_container.mount(container)
-        await container.mount(chatbox)
+        await self.chat_container.mount(ChatboxContainer(chatbox))
         self.scroll_to_latest_message()
 
     def scroll_to_latest_message(self):
-        if self.chat_container is not None:
-            # Calculate scroll position accounting for input area height
-            total_content_height = self.chat_container.virtual_size.height
-            visible_height = self.chat_container.size.height
+        # Calls within one frame share a single scroll, made after the pending layout has run
+        if self._scroll_timer is None:
+            self._scroll_timer = self.set_timer(1 / 30, self._scroll_pending)
 
-            # Calculate maximum scroll position
-            max_scroll = max(0, total_content_height - visible_height)
-
-            # Force scroll to bottom
-            self.chat_container.scroll_to(y=max_scroll, animate=False)
-            self.chat_container.refresh(layout=True)
+    def _scroll_pending(self) -> None:
+        self._scroll_timer = None
+        if self.chat_container is None:
+            return
+        max_scroll = self.chat_container.max_scroll_y
+        # Already at the bottom of content that has not grown
+        if max_scroll == self._last_scroll_y and self.chat_container.scroll_y == max_scroll:
+            return
+        self._last_scroll_y = max_scroll
+        self.chat_container.scroll_to(y=max_scroll, animate=False)
 
-    def process_content(self, content: str) -> str:
-        # Split content into lines first
+    async def process_content(self, content: str) -> str:
         lines = content.splitlines()
-        i = 0
-        assert self.debug_log
-
-        while i < len(lines):
-            line = lines[i]
-            split_line = line.split()
-            self.debug_log.write(split_line)
-
-            if len(split_line) == 2:
-                if line.startswith(":f ") or line.startswith("@file"):  # File command
-                    try:
-                        file_path = Path(split_line[1])
-                        if file_path.is_file():
-                            file_contents = file_path.read_text(encoding='utf-8')
-                            lines[i] = f"# File: {file_path}\n{file_contents}"
-                            i += len(file_contents.splitlines()) + 1  # +1 for the header
-                        else:
-                            lines[i] = f"# Error: File not found - {file_path}"
-                    except Exception as e:
-                        lines[i] = f"# Error reading file: {str(e)}"
-
-                elif line.startswith(":d ") or line.startswith("@dir"):  # Directory command
-                    try:
-                        dir_path = Path(split_line[1])
-                        if dir_path.is_dir():
-                            dir_contents = []
-                            dir_contents.append(f"# Directory contents of: {dir_path}")
-                            for file_path in dir_path.rglob('*'):
-                                if (file_path.is_file() and
-                                    not any(ignore in str(file_path) for ignore in ['.git', '__pycache__', 'node_modules']) and
-                                    file_path.suffix.lower() in ['.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.cpp', '.h', '.rs', '.go']):
-                                    try:
-                                        file_contents = file_path.read_text(encoding='utf-8')
-                                        dir_contents.append(f"\n# File: {file_path.relative_to(dir_path)}\n{file_contents}")
-                                    except (UnicodeDecodeError, PermissionError):
-                                        continue
-                            if len(dir_contents) > 1:  # If we found any files
-                                lines[i] = '\n'.join(dir_contents)
-                                i += len(dir_contents)
-                            else:
-                                lines[i] = f"# No readable source files found in directory: {dir_path}"
-                        else:
-                            lines[i] = f"# Error: Directory not found - {dir_path}"
-                    except Exception as e:
-                        lines[i] = f"# Error reading directory: {str(e)}"
-            i += 1
-
-        # Join the lines back into a single string
-        processed_content = '\n'.join(lines)
-        self.debug_log.write(processed_content)
+        # Most messages name no files; hand those back untouched
+        if not any(_CMD.match(line) for line in lines):
+            return content
+
+        # Disk access runs on a thread so the UI keeps responding
+        processed_content = await asyncio.to_thread(lambda: '\n'.join(self._expand(lines)))
+        if self._debug_enabled and self.debug_log:
+            self.debug_log.write(processed_content)
         return processed_content
 
+    @classmethod
+    def _expand(cls, lines: Iterable[str]) -> Iterator[str]:
+        """Yield the lines of a message with each file or directory command replaced by what it names"""
+        for line in lines:
+            m = _CMD.match(line)
+            if not m:
+                yield line
+            elif m["cmd"] in _FILE_COMMANDS:  # File command
+                file_path = Path(m["arg"])
+                try:
+                    file_contents = cls._read_file_sync(file_path)
+                except Exception as e:
+                    yield f"# Error reading file: {str(e)}"
+                    continue
+                if file_contents is None:
+                    yield f"# Error: File not found - {file_path}"
+                else:
+                    yield f"# File: {file_path}"
+                    yield file_contents
+            else:  # Directory command
+                dir_path = Path(m["arg"])
+                try:
+                    dir_contents = cls._walk_dir_sync(dir_path)
+                except Exception as e:
+                    yield f"# Error reading directory: {str(e)}"
+                    continue
+                if dir_contents is None:
+                    yield f"# Error: Directory not found - {dir_path}"
+                elif dir_contents:  # If we found any files
+                    yield dir_contents
+                else:
+                    yield f"# No readable source files found in directory: {dir_path}"
+
+    @staticmethod
+    def _read_file_sync(file_path: Path) -> str | None:
+        """Read a file named by a file command, or None if there is no such file"""
+        if not file_path.is_file():
+            return None
+        return _read_truncated(file_path)
+
+    @staticmethod
+    def _walk_dir_sync(dir_path: Path) -> str | None:
+        """Collect the source files under a directory named by a directory command.
+
+        Returns None if there is no such directory and an empty string if it holds no readable source files.
+        """
+        if not dir_path.is_dir():
+            return None
+        buf = io.StringIO()
+        buf.write(f"# Directory contents of: {dir_path}")
+        found = False
+        budget = _MAX_DIR_BYTES
+        for relative_path in _list_project_files(os.fspath(dir_path)):
+            if budget <= 0:
+                buf.write("\n\n# ... remaining files truncated")
+                break
+            try:
+                file_contents = _read_truncated(dir_path / relative_path, min(_MAX_FILE_BYTES, budget))
+            except (OSError, UnicodeDecodeError):
+                continue
+            budget -= len(file_contents)
+            found = True
+            buf.write("\n\n# File: ")
+            buf.write(relative_path)
+            buf.write("\n")
+            buf.write(file_contents)
+        return buf.getvalue() if found else ""
+
     async def chat(self, content: str):
         try:
             # Create user message box
-            if self.debug_log:
+            if self._debug_enabled and self.debug_log:
                 self.debug_log.write("Creating user message\n")
             #Check if this is a new chat and create one
             if self.is_new_chat:
                 self.chat_history.add_conversation(content)
                 self.is_new_chat = False
-                #self.chat_history.refresh(layout=True)
-                option_list = self.chat_history.query_one(OptionList)
-                option_list.clear_options()
-                updated_options = self.chat_history._load_conversations()
-                option_list.add_options([Option(data["chat_name"] if len(data["chat_name"]) < 40 else data["chat_name"][:40] + "...", id=conv_id) for conv_id, data in updated_options.items()])
+                self.chat_history.add_conversation_option(self.chat_history.current_chat_id)
 
             user_box = Chatbox(content)
             assert self.chat_container is not None
@@ -325,56 +478,141 @@ class Chat(Widget):
 
             # Show typing indicator
             self.responding_indicator.display = True
-            # Update state with user input
-            self.state["messages"] = self.state["messages"] + [{
-                "role": "user",
-                "content": content
-            }]
-            self._app.zapper.add_user_input_to_summaries(content)
-
-            self.state["current_input"] = content
+            # Update state with user input once any summary still being written has landed
+            async with self._state_lock:
+                self.state["messages"].append({
+                    "role": "user",
+                    "content": content
+                })
+                self._app.zapper.add_user_input_to_summaries(content)
+
+            # Expand @file/@dir commands into the files they name before they reach the model
+            self.state["current_input"] = await self.process_content(content)
             self.state["should_end"] = False
 
             # Process through graph
-            if self.debug_log:
+            if self._debug_enabled and self.debug_log:
                 self.debug_log.write("Processing through graph\n")
             try:
                 ai_box = Chatbox("", is_ai=True)
                 await self.mount_chat_boxes([ai_box])
-                response = []
-                async def stream_response():
-                    assert self.chat_container
-                    prompt = self.prompt.format_messages(input=self.state["current_input"], context=self.context)
-                    async for chunk in self.llm.astream(prompt):
-                        response.append(chunk.content)
-                        ai_box.update_content(response)
-                        await asyncio.sleep(0.01)
-                        ai_box.refresh(layout=True)
-                        self.chat_container.refresh(layout=True)
-                        self.scroll_to_latest_message()
-                    await asyncio.sleep(0.05)  # Slightly longer delay for final update
-                    ai_box.refresh(layout=True)
-                    self.chat_container.refresh(layout=True)
-                    self.scroll_to_latest_message()
-                    return "".join(response)
-                self.run_worker(stream_response)
+                # The worker hides the typing indicator once the reply has finished streaming
+                self._streaming_box = ai_box
+                self._stream_response(ai_box)
 
             except Exception as e:
-                if self.debug_log:
+                if self._debug_enabled and self.debug_log:
                     self.debug_log.write(f"Error in process_input: {str(e)}\n")
             #self.state = self.graph.invoke(self.state)
 
-            if self.debug_log:
+            if self._debug_enabled and self.debug_log:
                 self.debug_log.write(f"{self.state['messages']}\n")
             self.scroll_to_latest_message()
-            self.responding_indicator.display = False
 
         except Exception as e:
-            if self.debug_log:
+            if self._debug_enabled and self.debug_log:
                 self.debug_log.write(f"Error in chat: {str(e)}\n")
-                import traceback
                 self.debug_log.write(traceback.format_exc())
 
+    @work(exclusive=True, group="llm")
+    async def _stream_response(self, ai_box: Chatbox) -> str:
+        """Stream the model's reply into ai_box token by token and return the full text."""
+        assert self.chat_container
+        start = self._trim_context(self.context, self.state["current_input"])
+        inputs = {"input": self.state["current_input"], "context": self.context}
+        response = []
+        renderer = asyncio.create_task(self._render_stream())
+        try:
+            async for chunk in self.llm.astream(self._format_user_turn(inputs["input"], inputs["context"], start)):
+                response.append(chunk.content)
+                ai_box.append_content(chunk.content)
+                self._mark_dirty(ai_box)
+        finally:
+            renderer.cancel()
+            self._flush_dirty()
+            # A newer reply may have replaced this one; leave its indicator alone
+            if self._streaming_box is ai_box:
+                self._streaming_box = None
+                self.responding_indicator.display = False
+        return "".join(response)
+
+    def _format_user_turn(self, input: str, context: list[BaseMessage], start: int = 0) -> list[BaseMessage]:
+        """Build the messages for one turn from the fixed system prompt, the context from start on and the input."""
+        # The system prompt and context lead so each turn's request starts with the
+        # same prefix as the last one; only the new input differs at the end
+        return [
+            self._system_message,
+            HumanMessage(content=f"{CONTEXT_PREFIX}\n{self._render_context(context, start)}\n\nUser: {input}"),
+        ]
+
+    def _render_context(self, context: list[BaseMessage], start: int = 0) -> str:
+        """Render context[start:] as text, reusing the last rendering while the list only grows."""
+        context_id, first, count, last, text = self._context_render
+        if (id(context) != context_id or first != start or count > len(context)
+                or (count > start and context[count - 1] is not last)):
+            count, text = start, ""
+        if count < len(context):
+            new_lines = "\n".join(f"{message.type}: {message.content}" for message in context[count:])
+            text = f"{text}\n{new_lines}" if text else new_lines
+            self._context_render = (id(context), start, len(context), context[-1], text)
+        return text
+
+    def _trim_context(self, context: list[BaseMessage], input: str) -> int:
+        """Return the index of the oldest context message that still fits the model's window with room for the reply.
+
+        The context itself is left alone; only the prompt skips the messages before that index.
+        """
+        counts = self._context_tokens
+        if id(context) != self._context_tokens_id or len(counts) > len(context):
+            counts.clear()
+            self._context_start = 0
+            self._context_tokens_kept = 0
+            self._context_tokens_id = id(context)
+        # Only messages added since the last turn need counting
+        for message in context[len(counts):]:
+            tokens = _count_tokens(str(message.content))
+            counts.append(tokens)
+            self._context_tokens_kept += tokens
+
+        max_tokens = _MODEL_MAX_TOKENS.get(getattr(self.llm, "model_name", ""), _DEFAULT_MAX_TOKENS)
+        budget = max_tokens - _MAX_NEW_TOKENS - _count_tokens(SYS) - _count_tokens(f"{CONTEXT_PREFIX}\n\n\nUser: {input}")
+        start = self._context_start
+        # Skip the oldest messages until the rest fits, but always keep the newest one
+        while start < len(counts) - 1 and self._context_tokens_kept > budget:
+            self._context_tokens_kept -= counts[start]
+            start += 1
+        # A bigger window (or a smaller input) brings skipped messages back
+        while start and self._context_tokens_kept + counts[start - 1] <= budget:
+            start -= 1
+            self._context_tokens_kept += counts[start]
+        self._context_start = start
+        if start and self._debug_enabled and self.debug_log:
+            self.debug_log.write(f"Left out {start} context messages to fit {max_tokens} tokens\n")
+        return start
+
+    def _mark_dirty(self, box: Chatbox) -> None:
+        self._dirty_boxes.add(box)
+        self._stream_dirty.set()
+
+    async def _render_stream(self) -> None:
+        """Flush dirty chatboxes as tokens arrive, at most once a frame; idle costs nothing."""
+        while True:
+            await self._stream_dirty.wait()
+            self._stream_dirty.clear()
+            self._flush_dirty()
+            await asyncio.sleep(_STREAM_FRAME)
+
+    def _flush_dirty(self) -> None:
+        """Lay out the chatboxes that grew since the last tick and scroll to the bottom once."""
+        if not self._dirty_boxes:
+            return
+        for box in self._dirty_boxes:
+            box.refresh(layout=True)
+        self._dirty_boxes.clear()
+        assert self.chat_container
+        self.chat_container.refresh(layout=True)
+        self.scroll_to_latest_message()
+
     async def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
         if event.worker.state == WorkerState.SUCCESS and event.worker.result:
             response = event.worker.result
@@ -391,14 +629,18 @@ class Chat(Widget):
                     ai_message,
                     "Generating summary"
                 )
-                await self.summarize_and_update(str(response), ai_message)
+                # Summarize in the background so the next prompt can be sent right away
+                task = asyncio.create_task(self.summarize_and_update(str(response), ai_message))
+                self._bg_tasks.add(task)
+                task.add_done_callback(self._bg_tasks.discard)
 
 
 
     async def summarize_and_update(self, response: str, ai_message: MessageClass) -> None:
         try:
-            await self._app.zapper.summarize_message(str(response))
-            last_summary = self.context[-1]
+            async with self._state_lock:
+                await self._app.zapper.summarize_message(str(response))
+                last_summary = self.context[-1]
             summary_content = last_summary.content if isinstance(last_summary, AIMessage) else str(last_summary)
             summary_content = str(summary_content)
             ai_message.summary = summary_content
@@ -406,38 +648,28 @@ class Chat(Widget):
                 self.chat_history.update_conversation_single(self.chat_history.current_chat_id, ai_message, summary_content if summary_content else "no summary found")
 
         except Exception as e:
-            if self.debug_log:
+            if self._debug_enabled and self.debug_log:
                 self.debug_log.write(f"Error in summarization: {str(e)}\n")
 
     async def mount_chat_boxes(self, boxes: list[Chatbox]):
-        if self.debug_log:
+        if self._debug_enabled and self.debug_log:
             self.debug_log.write(f"Mounting {len(boxes)} messages\n")
         assert self.chat_container
 
-        for box in boxes:
-            # Create a simple container with the content
-            container = ChatboxContainer()
-            await self.chat_container.mount(container)
-            await container.mount(box)
-
-            container.refresh(layout=True)
-            box.refresh(layout=True)
-            self.chat_container.refresh(layout=True)
-
-            await asyncio.sleep(0.01)
-            self.scroll_to_latest_message()
-
-        self.chat_container.refresh(layout=True)
-        await asyncio.sleep(0.01)  # Small delay to ensure layout is updated
+        # Mount every box in its container in one go; mounting already invalidates layout
+        await self.chat_container.mount_all([ChatboxContainer(box) for box in boxes])
         self.scroll_to_latest_message()
 
     def _debug_widget_tree(self, widget, depth):
-        if self.debug_log is None:
+        if not self._debug_enabled or self.debug_log is None:
             return
-        indent = "  " * depth
-        self.debug_log.write(f"{indent}{widget}\n")
-        for child in widget.children:
-            self._debug_widget_tree(child, depth + 1)
+        # Depth-first with an explicit stack, so the log keeps the nested order
+        stack = deque([(widget, depth)])
+        while stack:
+            widget, depth = stack.pop()
+            indent = _INDENTS[depth] if depth < len(_INDENTS) else "  " * depth
+            self.debug_log.write(f"{indent}{widget}\n")
+            stack.extend((child, depth + 1) for child in reversed(widget.children))
 
     # Use this method to load a conversation into the current llm state
     def state_loader(self, messages):
@@ -4,16 +4,23 @@ from textual.containers import ScrollableContainer, Vertical, VerticalScroll
 from textual.binding import Binding
 from textual.message import Message
 from textual import on, events
-from textual.css.query import NoMatches
 from textual.events import Key
+from textual.timer import Timer
 #from textual_autocomplete import AutoComplete, Dropdown, DropdownItem, InputState
 
 from textual_components.commands.file_search import SlashCommandPopup
 
 from typing import List
 import os
+import re
 from dataclasses import dataclass
-from functools import lru_cache
+
+# A popup trigger and its space right before the cursor, anywhere in the line
+_TRIGGER_RE = re.compile(r'(@file|@dir) $')
+# How long typing must pause on a trigger before its popup opens
+_TRIGGER_DELAY = 0.15
+# Whether the popup opened by each trigger lists directories rather than files
+_LISTS_DIRECTORIES = {"@file": False, "@dir": True}
 
 @dataclass
 class InputState:
@@ -55,10 +62,24 @@ class ChatInputArea(TextArea):
     def post_height_change(self, height):
         self.post_message(self.HeightChange(height))
 
+    def set_height(self, height: str) -> None:
+        """Resize the input and announce it, unless it is already at that height"""
+        if height == self._height:
+            return
+        self._height = height
+        self.styles.height = height
+        self.post_height_change(height)
+
     def __init__(self, chat, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.chat = chat
         self.current_command = None
+        # The last popup mounted here; it removes itself on confirm or escape
+        self._popup: SlashCommandPopup | None = None
+        # Height last applied through set_height
+        self._height: str | None = None
+        # Pending check for a popup trigger, restarted by each edit
+        self._trigger_timer: Timer | None = None
 
     def _on_focus(self, event: events.Focus) -> None:
         super()._on_focus(event)
@@ -66,110 +87,47 @@ class ChatInputArea(TextArea):
 
 
     @on(TextArea.Changed)
-    async def on_input_changed(self, event: TextArea.Changed):
+    def on_input_changed(self, event: TextArea.Changed):
+        # Wait for a pause in typing, so a burst of edits costs one check
+        if self._trigger_timer is not None:
+            self._trigger_timer.stop()
+        self._trigger_timer = self.set_timer(_TRIGGER_DELAY, self._check_trigger)
+
+    async def _check_trigger(self) -> None:
+        self._trigger_timer = None
         cursor = self.cursor_location
         if cursor is None:
             return
         current_line = self.document.get_line(cursor[0])
-        # Only show for /file command and when there's a space after it
-        if str("@file") in current_line and cursor[1] - (current_line.index("@file")+5) == 1:
-            # Remove any existing popup
-            existing = self.query("SlashCommandPopup")
-            for widget in existing:
-                widget.remove()
-
-            # Create new popup
-            popup = SlashCommandPopup(self)
-            self.styles.height = "25"
-            self.post_message(self.HeightChange("25"))
-            await self.mount(popup)
-        if str("@dir") in current_line and cursor[1] - (current_line.index("@dir")+4) == 1:
-            # Remove any existing popup
-            existing = self.query("SlashCommandPopup")
-            for widget in existing:
-                widget.remove()
-
-            # Create new popup
-            popup = SlashCommandPopup(self, get_directories=True)
-            self.styles.height = "25"
-            self.post_message(self.HeightChange("25"))
-            await self.mount(popup)
+        # Only show when there's a space after the trigger and the cursor is past it
+        match = _TRIGGER_RE.search(current_line, 0, cursor[1])
+        if match:
+            await self._open_popup(_LISTS_DIRECTORIES[match.group(1)])
 
     @on(Key)
     def on_key(self, event: Key) -> None:
-        try:
-            if event.key in ("ctrl+enter", "shift+enter"):
-                self.post_message(ChatInputArea.Submit(self))
-                self.styles.height = 25
-                return
-            if self.query_one("SlashCommandPopup") and event.key == "enter":
-                popup = self.query_one("SlashCommandPopup")
-                popup.confirm_selection()
-                event.prevent_default()
-                self.styles.height = "auto"
-                self.post_message(self.HeightChange("auto"))
-                return
-        except NoMatches:
-            pass
-
-    async def handle_command(self, current_line):
-        cursor = self.cursor_location
-        if cursor is None: return
-        current_line = self.document.get_line(cursor[0])
-        if (current_line.startswith("@file") and cursor[1] - (current_line.index("@file")+5) == 1) or (current_line.startswith(":f") and cursor[1] - (current_line.index(":f")+2) == 1):
-            # Remove any existing popup
-            existing = self.query("SlashCommandPopup")
-            for widget in existing:
-                widget.remove()
-
-            # Create new popup
-            popup = SlashCommandPopup(self, get_directories=False)
-            self.styles.height = "25"
-            self.post_message(self.HeightChange("25"))
-            await self.mount(popup)
-        if (current_line.startswith("@dir") and cursor[1] - (current_line.index("@dir")+4) == 1) or (current_line.startswith(":d") and cursor[1] - (current_line.index(":d")+2) == 1):
-            # Remove any existing popup
-            existing = self.query("SlashCommandPopup")
-            for widget in existing:
-                widget.remove()
-
-            # Create new popup
-            popup = SlashCommandPopup(self, get_directories=True)
-            self.styles.height = "25"
-            self.post_message(self.HeightChange("25"),bubble=True)
-            await self.mount(popup)
-
-    @lru_cache
-    def _get_files(self, max_files: int = 100) -> List[str]:
-        """Get filtered list of files from current directory"""
-        ignore_patterns = {
-            # Directories to ignore
-            '.git', '__pycache__', 'node_modules', 'venv', '.env',
-            # File patterns to ignore
-            '*.pyc', '*.pyo', '*.pyd', '*.so', '*.dll',
-            '*.exe', '*.bin', '*.obj', '*.cache',
-            # Add more patterns as needed
-        }
-
-        files = []
-        cwd = os.getcwd()
-
-        for root, dirs, filenames in os.walk(cwd, topdown=True):
-            # Filter out ignored directories
-            dirs[:] = [d for d in dirs if d not in ignore_patterns]
-
-            for filename in filenames:
-                # Skip ignored file patterns
-                if any(filename.endswith(pat.replace('*', '')) for pat in ignore_patterns):
-                    continue
+        if event.key in ("ctrl+enter", "shift+enter"):
+            self.post_message(ChatInputArea.Submit(self))
+            self.set_height("25")
+            return
+        if event.key == "enter" and self._popup_open():
+            self._popup.confirm_selection()
+            event.prevent_default()
+            self.set_height("auto")
+            return
 
-                rel_path = os.path.relpath(os.path.join(root, filename), cwd)
-                files.append(rel_path)
+    def _popup_open(self) -> bool:
+        """Whether a popup is mounted, checked without querying the DOM"""
+        return self._popup is not None and self._popup.is_attached
 
-                if len(files) >= max_files:
-                    return sorted(files)
+    async def _open_popup(self, get_directories: bool) -> None:
+        """Replace any existing popup with a new one"""
+        if self._popup_open():
+            await self._popup.remove()
+        self.set_height("25")
+        self._popup = SlashCommandPopup(self, get_directories=get_directories)
+        await self.mount(self._popup)
 
-        return sorted(files)
     #def action_search(self):
         #self.screen.action_search()
 
@@ -1,9 +1,12 @@
 from textual.widgets import Input, Static
 from textual.containers import Container
 from textual.app import ComposeResult
-from textual import on
+from textual import on, work
 from textual.message import Message
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from functools import lru_cache
+from itertools import islice
+import asyncio
 import os
 import fnmatch
 import shutil
@@ -11,6 +14,75 @@ import subprocess
 from pathlib import Path
 import json
 
+# Most entries the popup lists for one search
+_MAX_ITEMS = 50
+
+
+class _PrefixTrie:
+    """Radix trie from lowercased keys to file paths; each edge holds a run of characters"""
+
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        # First character of an edge -> (edge label, child)
+        self.children: dict[str, tuple[str, "_PrefixTrie"]] = {}
+        self.values: List[str] = []
+
+    def insert(self, key: str, value: str) -> None:
+        node = self
+        while key:
+            edge = node.children.get(key[0])
+            if edge is None:
+                leaf = _PrefixTrie()
+                node.children[key[0]] = (key, leaf)
+                node = leaf
+                break
+            label, child = edge
+            common = len(os.path.commonprefix((label, key)))
+            if common < len(label):
+                # Split the edge where the new key leaves it
+                middle = _PrefixTrie()
+                middle.children[label[common]] = (label[common:], child)
+                node.children[key[0]] = (label[:common], middle)
+                child = middle
+            node = child
+            key = key[common:]
+        node.values.append(value)
+
+    def starts_with(self, query: str) -> Iterator[str]:
+        """Yield the values of every key starting with query, in key order"""
+        node = self
+        while query:
+            edge = node.children.get(query[0])
+            if edge is None:
+                return
+            label, child = edge
+            if label.startswith(query):
+                node = child
+                break
+            if not query.startswith(label):
+                return
+            node = child
+            query = query[len(label):]
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield from node.values
+            stack.extend(node.children[first][1] for first in sorted(node.children, reverse=True))
+
+
+@lru_cache(maxsize=4)
+def _trie_for(files: tuple[str, ...]) -> _PrefixTrie:
+    """Index files by full path and by file name, shared by every popup listing the same files"""
+    trie = _PrefixTrie()
+    for path in files:
+        trie.insert(path.lower(), path)
+        name = os.path.basename(path).lower()
+        if name != path.lower():
+            trie.insert(name, path)
+    return trie
+
+
 class SlashCommandItem(Static):
     """Individual command item in the list"""
 
@@ -184,7 +256,8 @@ class SlashCommandPopup(Container):
             '*.map', '*.css.map', '*.js.map'
         }
 
-        self._cached_files = self.find_project_files()
+        # Filled in by _load_files once the popup is mounted
+        self._cached_files: List[str] = []
 
     def find_project_files(self, max_files=100):
         """A fast hybrid approach to find important files in a project"""
@@ -294,16 +367,34 @@ class SlashCommandPopup(Container):
     def on_mount(self):
         self.search_input.focus()
         self._update_items()
+        self._load_files()
+
+    @work(exclusive=True, group="popup-files")
+    async def _load_files(self) -> None:
+        """List the project's files on a thread, then show them under the current search"""
+        self._cached_files = await asyncio.to_thread(self.find_project_files)
+        self._update_items(self.search_input.value)
 
     def _update_items(self, filter_text: str = ""):
         """Update the displayed items based on filter"""
         self.items_container.remove_children()
         self.items.clear()
 
-        filtered_files = [
-            f for f in self._cached_files
-            if all(term.lower() in f.lower() for term in filter_text.split())
-        ]
+        terms = filter_text.lower().split()
+        if terms:
+            # Paths or file names starting with the first term come first;
+            # the substring scan only runs when they don't fill the list
+            matches = (f for f in _trie_for(tuple(self._cached_files)).starts_with(terms[0])
+                       if all(term in f.lower() for term in terms[1:]))
+            filtered_files = list(islice(dict.fromkeys(matches), _MAX_ITEMS))
+            if len(filtered_files) < _MAX_ITEMS:
+                seen = set(filtered_files)
+                filtered_files.extend(islice(
+                    (f for f in self._cached_files
+                     if f not in seen and all(term in f.lower() for term in terms)),
+                    _MAX_ITEMS - len(filtered_files)))
+        else:
+            filtered_files = self._cached_files[:_MAX_ITEMS]
 
         for idx, file in enumerate(filtered_files):
             item = SlashCommandItem(file, selected=(idx == 0))
@@ -338,7 +429,7 @@ class SlashCommandPopup(Container):
     def on_key(self, event):
         if event.key == "escape":
             self.remove()
-            self.parent.styles.height = "auto"
+            self.text_area.set_height("auto")
             event.prevent_default()
         elif event.key == "enter":
             self._confirm_selection()
@@ -378,5 +469,5 @@ class SlashCommandPopup(Container):
         end = self.text_area.cursor_location[1]
         self.text_area.refresh(layout=True)
         self.remove()
-        self.text_area.styles.height = "auto"
+        self.text_area.set_height("auto")
         self.text_area.focus()
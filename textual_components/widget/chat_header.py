@@ -1,5 +1,4 @@
 from __future__ import annotations
-import os
 
 from textual.reactive import reactive
 from textual.app import ComposeResult
@@ -10,8 +9,7 @@ from textual.containers import Horizontal
 from textual.message import Message
 from dataclasses import dataclass
 
-from langchain_groq import ChatGroq
-from pydantic import SecretStr
+from agents.llm import get_groq_llm
 
 class ChatHeader(Widget):
     """A header widget for the chat interface with model selection."""
@@ -172,15 +170,8 @@ class ChatHeader(Widget):
         if selected_value and selected_value != Select.BLANK:
             model_id = next(id for id, name in self.MODELS if name == selected_value)
             self.model_name = model_id
-            api_key = os.getenv('GROQ_API_KEY')
-            if not api_key:
-                raise ValueError("GROQ_API_KEY environment variable is not set")
-            # Initialize the LLM
-            self.parent_chat.llm = ChatGroq(
-                    model=model_id,
-                    api_key= SecretStr(api_key),
-                    temperature=0,
-                    stop_sequences=None)
+            # Reuse the model's client if it has been selected before
+            self.parent_chat.llm = get_groq_llm(model_id)
             self.post_message(self.ModelChanged(model_id, str(selected_value)))
 
     def update_title_display(self) -> None:
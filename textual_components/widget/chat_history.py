@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Dict, Literal, List, Optional
@@ -9,18 +10,23 @@ from textual.binding import Binding
 from textual.reactive import var
 from textual.widget import Widget
 from textual.widgets import Button, OptionList, Static
-from textual.widgets.option_list import Option
+from textual.widgets.option_list import Option, OptionDoesNotExist
 from textual.containers import Vertical
 
 
 from pathlib import Path
 from shortuuid import uuid
+import asyncio
 import json
 import os
-from functools import lru_cache
 
 from .footer import CommandFooter, Command, Field
 
+
+def _truncate(name: str, limit: int = 40) -> str:
+    """Shorten a chat name to fit the history list"""
+    return name if len(name) < limit else name[:limit] + "..."
+
 @dataclass
 class ConversationIndex:
     path: str
@@ -51,6 +57,8 @@ class ChatHistory(Widget):
     index: Dict[str, ConversationIndex]
 
     _conversation_cache = {}
+    # History list entries by conversation id, built once per name
+    _option_cache: Dict[str, Option] = {}
 
     def __init__(self, app):
         super().__init__()
@@ -60,8 +68,12 @@ class ChatHistory(Widget):
         self.conversation_path = self.app_dir / "conversations"
         self.current_chat_id = ""
         self.is_new_chat = True
+        # Read from disk once; afterwards the in-memory index is the source of truth
         self.index = self._load_index()
-        self.options = self._load_conversations()
+        self.options = self.index
+        # Index writes run on a thread, one at a time and in order
+        self._index_lock = asyncio.Lock()
+        self._save_tasks: set[asyncio.Task] = set()
 
 
     @dataclass
@@ -79,7 +91,7 @@ class ChatHistory(Widget):
                     )
                 )
                 self.option_list = OptionList(
-                    *[Option(data["chat_name"] if len(data["chat_name"]) < 40 else data["chat_name"][:40 ] + "...", id=conv_id) for conv_id, data in self.options.items()],
+                    *[self._make_option(conv_id, data) for conv_id, data in self.options.items()],
                     id="cl-option-list",
                 )
                 yield self.option_list
@@ -88,18 +100,45 @@ class ChatHistory(Widget):
                 yield Button("New Chat", id="cl-new-chat-button")
 
     def _load_conversations(self):
+        return self.index
+
+    def _save_index(self) -> None:
+        """Write the index to disk in the background, from a snapshot taken now"""
+        data = json.dumps(self.index, indent=4)
+        task = asyncio.create_task(self._write_index(data))
+        self._save_tasks.add(task)
+        task.add_done_callback(self._save_tasks.discard)
+
+    async def _write_index(self, data: str) -> None:
+        async with self._index_lock:
+            try:
+                await asyncio.to_thread(Path(self.index_path).write_text, data)
+            except OSError as e:
+                self.notify(f"Could not save chat history: {e}", severity="error")
+
+    async def on_unmount(self) -> None:
+        # Let pending index writes land before the app exits; a failure must not break shutdown
+        if self._save_tasks:
+            await asyncio.gather(*self._save_tasks, return_exceptions=True)
+
+    def _make_option(self, conv_id: str, data: dict) -> Option:
+        option = self._option_cache.get(conv_id)
+        if option is None:
+            option = self._option_cache[conv_id] = Option(_truncate(data["chat_name"]), id=conv_id)
+        return option
+
+    def add_conversation_option(self, conv_id: str) -> None:
+        """Append one conversation to the history list without rebuilding it"""
+        if conv_id in self.index:
+            self.option_list.add_option(self._make_option(conv_id, self.index[conv_id]))
+
+    def _load_index(self) -> OrderedDict:
         if Path(self.index_path).exists():
             with open(self.index_path, 'r') as f:
-                return json.load(f)
-        return {}
-
-    def _load_index(self):
-        if Path(self.index_path).exists():
-            with open(self.index_path, 'r') as f:
-                index = json.load(f)
+                index = json.load(f, object_pairs_hook=OrderedDict)
             f.close()
             return index
-        index = dict()
+        index = OrderedDict()
         return index
 
     def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
@@ -124,49 +163,38 @@ class ChatHistory(Widget):
 
             self.screen.set_focus(footer)
             print("Focus set to footer")  # Debug print
-            self.options = self._load_conversations()
-
-            self.option_list.clear_options()
-            # Add new options
-            for conv_id, data in self.options.items():
-                display_name = data["chat_name"] if len(data["chat_name"]) < 40 else data["chat_name"][:40] + "..."
-                self.option_list.add_option(Option(display_name, id=conv_id))
             self._app.chat_container.remove_children()
             self.refresh(layout=True)
 
     # REDO THIS METHOD THIS IS SHIT
     def delete_conversation(self, conversation_id: str) -> bool:
-        index = None
-        if Path(self.index_path).exists():
-            with open(self.index_path, 'r') as f:
-                index = json.load(f)
         if conversation_id not in self.index:
             return False
 
-        file_path = Path(self.index[conversation_id]["path"])
+        file_path = self.app_dir / self.index[conversation_id]["path"]
         try:
             file_path.unlink()
         except FileNotFoundError:
             pass
-        assert index
-        del index[conversation_id]
+        del self.index[conversation_id]
         if conversation_id in self._conversation_cache:
             del self._conversation_cache[conversation_id]
-        with open(self.index_path, 'w') as f:
-            json.dump(index, f, indent=4)
+        self._option_cache.pop(conversation_id, None)
+        try:
+            self.option_list.remove_option(conversation_id)
+        except OptionDoesNotExist:
+            pass
+        self._save_index()
         return True
 
     # REDO THIS METHOD THIS IS SHIT
     def rename_conversation(self, conversation_id: str, new_name: str) -> bool:
-        index = None
-        if Path(self.index_path).exists():
-            with open(self.index_path, 'r') as f:
-                index = json.load(f)
-            f.close()
-        if not index or conversation_id not in index:
+        if conversation_id not in self.index:
             return False
-        file_path = Path(index[conversation_id]["path"])
-        file_path.rename(new_name)
+        self.index[conversation_id]["chat_name"] = new_name
+        self._option_cache.pop(conversation_id, None)
+        self.option_list.replace_option_prompt(conversation_id, _truncate(new_name))
+        self._save_index()
         return True
 
     def add_conversation(self, name: str | None) -> bool:
@@ -174,28 +202,19 @@ class ChatHistory(Widget):
             conv_id = uuid()
             if not name:
                 name = str(datetime.now())
-            index = None
-            if Path(self.index_path).exists():
-                with open(self.index_path, 'r') as f:
-                    index = json.load(f)
-                f.close()
-            else:
-                index = {}
             relative_path = f"conversations/{conv_id}.json"
             conv_file_path = self.app_dir / relative_path
-            index[conv_id] = {"path": relative_path, "chat_name": name, "timestamp": str(datetime.now())}
             new_conversation = {
                 "id": conv_id,
                 "name": name,
                 "timestamp": str(datetime.now()),
                 "messages": []  # Initialize empty messages list
             }
-            # Write the new conversation file
+            # Write the new conversation file now; messages are appended to it right away
             with open(conv_file_path, 'w') as f:
                 json.dump(new_conversation, f, indent=4)
-            with open(self.index_path, 'w') as f:
-                json.dump(index, f, indent=4)
-            self.index = index
+            self.index[conv_id] = {"path": relative_path, "chat_name": name, "timestamp": str(datetime.now())}
+            self._save_index()
             self.refresh()
             self.current_chat_id = conv_id
             return True
@@ -288,15 +307,8 @@ class ChatHistory(Widget):
             return []
 
     def get_conversation_name(self, conversation_id: str):
-        conversation_index = self.index[conversation_id]
+        # The index holds the current name; renames only update the index
+        conversation_index = self.index.get(conversation_id)
         if not conversation_index:
             return "Untitled chat"
-        file_path = Path(str(self.app_dir) + "/" + conversation_index["path"])
-        try:
-            with open(file_path, 'r') as f:
-                contents = json.load(f)
-                print(contents)
-                return contents["name"]
-        except Exception as e:
-            print('conversation not found')
-            return "Untitled chat"
+        return conversation_index.get("chat_name") or "Untitled chat"
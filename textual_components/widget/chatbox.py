@@ -34,9 +34,11 @@ class Chatbox(Static, can_focus=True):  # Change Widget to Static
     ]
 
     def __init__(self, content: str, is_ai: bool = False):
-        super().__init__(content)  # Pass content to Static
+        # Rendering goes through the markdown property, so Static keeps no copy of the text
+        super().__init__()
         self.is_ai = is_ai
-        self.content = content
+        # The message text, as streamed pieces joined on first read
+        self._chunks: list[str] = [content]
         self.styles.height = "auto"
         self.styles.min_height = "1"
         self.styles.width = "100%"
@@ -44,6 +46,7 @@ class Chatbox(Static, can_focus=True):  # Change Widget to Static
         self.styles.padding = (1, 2, 2, 2)
         self.styles.visibility = "visible"
         self.current_length = len(content)
+        self._markdown: Markdown | None = None
         self.update_content(content)
         self.prefix_added = False
         self.is_streaming = False
@@ -58,7 +61,6 @@ class Chatbox(Static, can_focus=True):  # Change Widget to Static
             self.add_class("assistant-message")
         self.styles.height = "auto"
         self.styles.width = 'auto'
-        self.refresh(layout=True)
 
     def get_code_blocks(self, markdown_string):
         pattern = r"```(.*?)\n(.*?)```"
@@ -80,10 +82,24 @@ class Chatbox(Static, can_focus=True):  # Change Widget to Static
         pyperclip.copy(self.content)
         self.notify("Message content has been copied to clipboard", timeout=3)
 
+    @property
+    def content(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0]
+
+    @content.setter
+    def content(self, content: str) -> None:
+        # Unlike Static.content, setting this neither parses markup nor refreshes
+        self._chunks = [content]
+        self._markdown = None
+
     @property
     def markdown(self) -> Markdown:
-        print(self.content)
-        return Markdown(self.content)
+        # Parsed once per content change rather than on every repaint
+        if self._markdown is None:
+            self._markdown = Markdown(self.content)
+        return self._markdown
 
     def render(self) -> RenderableType:
         return self.markdown
@@ -96,4 +112,14 @@ class Chatbox(Static, can_focus=True):  # Change Widget to Static
         new_content = "".join(content)
         self.content = new_content
         self.current_length = len(new_content)
+        self._markdown = None
         self.refresh(layout=True)
+
+    def append_content(self, token: str) -> None:
+        """Add a streamed token to the end of the message without re-joining earlier ones.
+
+        The caller refreshes the box, so a burst of tokens costs one layout pass.
+        """
+        self._chunks.append(token)
+        self.current_length += len(token)
+        self._markdown = None